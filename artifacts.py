@@ -0,0 +1,37 @@
+# artifacts.py
+import json
+import os
+
+ARTIFACT_DIR = "artifacts"  # Intermediate outputs of the stages run through cli.py
+
+def artifact_path(name, directory=ARTIFACT_DIR):
+    """Return the path of a stage's JSONL artifact, e.g. artifacts/rss.jsonl."""
+    return os.path.join(directory, f"{name}.jsonl")
+
+def write_records(path, records):
+    """
+    Stream records (dicts) to a JSONL file, one record per line. The file is written to a
+    temp file and renamed once complete, so a failed stage never leaves a truncated artifact.
+    Returns the number of records written.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    count = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+                count += 1
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    print(f"✅ {count} records written to {path}")
+    return count
+
+def iter_records(path):
+    """Yield the records of a JSONL artifact one at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,223 @@
+# benchmarks/feed_farm.py
+# Mock feed farm for load testing the RSS fetcher: N synthetic feeds spread over many hosts,
+# with configurable response latency and fault injection.
+#
+# Hosts are distinct loopback addresses (127.x.y.z), so per-host connection pools, limits and
+# statistics see thousands of different hosts. Linux routes all of 127.0.0.0/8 to the loopback
+# interface; elsewhere only 127.0.0.1 usually exists, so use --hosts 1 there.
+#
+# Faults:
+#   malformed_rate  feeds whose XML is cut off halfway (the same feeds on every request)
+#   huge_rate       feeds padded to huge_mb megabytes (the same feeds on every request)
+#   timeout_rate    requests that stall for hang_seconds before answering
+#   error_rate      requests answered with a random 5xx
+#   reset_rate      requests whose connection is closed without a response
+#   burst_rate      share of hosts answering every request with 503 during a burst_seconds window
+#
+# Regular feeds are gzip-compressed for clients that accept it; huge feeds are always sent uncompressed.
+import gzip
+import multiprocessing
+import random
+import re
+import sys
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.stub_servers import make_rss_feed
+
+LATENCY_DISTRIBUTIONS = ["fixed", "uniform", "lognormal", "pareto"]
+
+FARM_DEFAULTS = {
+    "feeds": 1000,
+    "hosts": 100,
+    "episodes": 50,
+    "latency": "lognormal",     # One of LATENCY_DISTRIBUTIONS
+    "latency_ms": 50,           # Fixed value, uniform mean, lognormal median or pareto minimum
+    "latency_shape": 1.0,       # Lognormal sigma or pareto alpha; larger sigma / smaller alpha = heavier tail
+    "timeout_rate": 0.0,
+    "hang_seconds": 30,
+    "error_rate": 0.0,
+    "burst_rate": 0.0,
+    "burst_seconds": 10,
+    "huge_rate": 0.0,
+    "huge_mb": 20,
+    "malformed_rate": 0.0,
+    "reset_rate": 0.0,
+    "seed": 0,
+}
+
+ERROR_STATUSES = [500, 502, 503, 504]
+CHUNK_SIZE = 64 * 1024
+
+def host_address(host):
+    """Loopback address of farm host number `host` (0-based)."""
+    return f"127.{1 + host // 62500}.{host // 250 % 250}.{host % 250 + 1}"
+
+def farm_feed_urls(port, feeds, hosts):
+    """URLs of the farm's feeds; feed i lives on host i % hosts."""
+    if hosts == 1:
+        return [f"http://127.0.0.1:{port}/feeds/{i}.xml" for i in range(feeds)]
+    return [f"http://{host_address(i % hosts)}:{port}/feeds/{i}.xml" for i in range(feeds)]
+
+def sample_latency(config, rng):
+    """Draw one response delay in seconds from the configured distribution."""
+    ms, shape = config["latency_ms"], config["latency_shape"]
+    kind = config["latency"]
+    if kind == "fixed":
+        delay = ms
+    elif kind == "uniform":
+        delay = rng.uniform(0, 2 * ms)
+    elif kind == "lognormal":
+        delay = ms * rng.lognormvariate(0, shape)
+    elif kind == "pareto":
+        delay = ms * rng.paretovariate(shape)
+    else:
+        raise ValueError(f"Unknown latency distribution: {kind}")
+    return min(delay / 1000, config["hang_seconds"])
+
+def feed_fault(config, index):
+    """The persistent fault of feed `index`: "malformed", "huge" or None. Stable for a given seed."""
+    draw = random.Random(f"{config['seed']}:{index}").random()
+    if draw < config["malformed_rate"]:
+        return "malformed"
+    if draw < config["malformed_rate"] + config["huge_rate"]:
+        return "huge"
+    return None
+
+def host_in_burst(config, host, now=None):
+    """Whether `host` is inside a 5xx burst in the current burst window."""
+    if not config["burst_rate"]:
+        return False
+    window = int((now or time.time()) // config["burst_seconds"])
+    return zlib.crc32(f"{config['seed']}:{host}:{window}".encode()) / 2 ** 32 < config["burst_rate"]
+
+def make_farm_handler(config):
+    feed_cache = {}
+    gzip_cache = {}
+    rng = random.Random(config["seed"])
+
+    class FeedFarmHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _send(self, status, body, content_type="text/plain", headers=()):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_huge(self, feed):
+            # Valid XML padded with a comment, streamed so the farm never holds it in memory
+            head, tail = feed.split(b"<channel>", 1)
+            padding = config["huge_mb"] * 1024 * 1024
+            prefix, suffix = head + b"<channel><!-- ", b" -->" + tail
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(prefix) + padding + len(suffix)))
+            self.end_headers()
+            self.wfile.write(prefix)
+            chunk = b"x" * CHUNK_SIZE
+            for offset in range(0, padding, CHUNK_SIZE):
+                self.wfile.write(chunk[:min(CHUNK_SIZE, padding - offset)])
+            self.wfile.write(suffix)
+
+        def do_GET(self):
+            # The farm listens on every interface so all loopback addresses reach it; serve loopback only
+            if not self.client_address[0].startswith("127."):
+                self.close_connection = True
+                return
+            match = re.fullmatch(r"/feeds/(\d+)\.xml", self.path)
+            if not match or int(match.group(1)) >= config["feeds"]:
+                self._send(404, b"not found")
+                return
+            index = int(match.group(1))
+            # One draw picks the request's transient fault: consecutive bands of [0, 1) for stall, 5xx and reset
+            delay, draw = sample_latency(config, rng), rng.random()
+            if draw < config["timeout_rate"]:
+                time.sleep(config["hang_seconds"])
+            else:
+                time.sleep(delay)
+            draw -= config["timeout_rate"]
+            if host_in_burst(config, index % config["hosts"]):
+                self._send(503, b"burst", headers=[("Retry-After", "1")])
+                return
+            if 0 <= draw < config["error_rate"]:
+                status = rng.choice(ERROR_STATUSES)
+                self._send(status, b"injected error", headers=[("Retry-After", "1")] if status == 503 else ())
+                return
+            draw -= config["error_rate"]
+            if 0 <= draw < config["reset_rate"]:
+                self.close_connection = True
+                return
+            if index not in feed_cache:
+                feed_cache[index] = make_rss_feed(index, config["episodes"])
+            feed = feed_cache[index]
+            fault = feed_fault(config, index)
+            if fault == "huge":
+                self._send_huge(feed)
+            elif fault == "malformed":
+                self._send(200, feed[:len(feed) // 2], "application/rss+xml")
+            elif "gzip" in self.headers.get("Accept-Encoding", ""):
+                if index not in gzip_cache:
+                    gzip_cache[index] = gzip.compress(feed, mtime=0)
+                self._send(200, gzip_cache[index], "application/rss+xml", headers=[("Content-Encoding", "gzip")])
+            else:
+                self._send(200, feed, "application/rss+xml")
+
+        def log_message(self, format, *args):
+            pass
+
+    return FeedFarmHandler
+
+class _FarmServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connects under load, which shows up as 1s+ SYN retransmits
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # Clients giving up on stalled or huge responses are part of the test, not errors
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+def _serve(config, port_queue):
+    bind = "127.0.0.1" if config["hosts"] == 1 else ""
+    server = _FarmServer((bind, 0), make_farm_handler(config))
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+class FeedFarm:
+    """Run the feed farm in a child process; use as a context manager."""
+    def __init__(self, **config):
+        self.config = {**FARM_DEFAULTS, **config}
+        if self.config["latency"] not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.config['latency']}")
+        self.process = None
+        self.port = None
+
+    def __enter__(self):
+        port_queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=_serve, args=(self.config, port_queue), daemon=True)
+        self.process.start()
+        self.port = port_queue.get(timeout=10)
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join()
+        return False
+
+    def feed_urls(self):
+        return farm_feed_urls(self.port, self.config["feeds"], self.config["hosts"])
+
+    def fault_counts(self):
+        """Number of feeds with each persistent fault."""
+        counts = {"malformed": 0, "huge": 0}
+        for i in range(self.config["feeds"]):
+            fault = feed_fault(self.config, i)
+            if fault:
+                counts[fault] += 1
+        return counts
@@ -0,0 +1,134 @@
+# benchmarks/load_test.py
+# Load test of the RSS fetcher against the mock feed farm. Each worker count runs in a fresh
+# subprocess and scratch directory; throughput and tail latency come from the run's instrumentation.
+#
+#   python -m benchmarks.load_test --feeds 5000 --hosts 1000 --workers 1 8 32 64 \
+#       --latency pareto --latency-ms 80 --latency-shape 1.5 --timeout-rate 0.01 --error-rate 0.02
+import argparse
+import contextlib
+import io
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.feed_farm import FARM_DEFAULTS, LATENCY_DISTRIBUTIONS, FeedFarm, farm_feed_urls
+from benchmarks.run_benchmarks import _prepare_workspace
+from benchmarks.stub_servers import REPO_ROOT
+
+RESULT_MARKER = "LOAD_TEST_RESULT "
+
+def run_load(feeds, workers, timeout=None):
+    """Fetch `feeds` with fetch_rss_feed_data in this process and return the load test statistics."""
+    _prepare_workspace(feeds)
+    import fetch
+    import instrumentation
+    if timeout:
+        fetch.RSS_TIMEOUT = timeout
+    instrumentation.reset()
+    start = time.perf_counter()
+    records = len(fetch.fetch_rss_feed_data(feeds, workers=workers))
+    seconds = time.perf_counter() - start
+    timings, counters = instrumentation.snapshot()
+    latencies = timings.get("rss.feed", [])
+    return {
+        "workers": workers,
+        "feeds": len(feeds),
+        "records": records,
+        "seconds": seconds,
+        "feeds_per_sec": len(latencies) / seconds if seconds else 0.0,
+        "p50_ms": instrumentation.percentile(latencies, 50) * 1000,
+        "p95_ms": instrumentation.percentile(latencies, 95) * 1000,
+        "p99_ms": instrumentation.percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+        "failed": counters.get("rss.failed", 0),
+        "invalid": counters.get("rss.invalid", 0),
+        "transient": counters.get("rss.transient", 0),
+        "short_circuited": counters.get("rss.short_circuited", 0),
+        "rate_limited": counters.get("rss.rate_limited", 0),
+        "retries": counters.get("rss.retries", 0),
+        "megabytes": counters.get("rss.bytes", 0) / 1e6,
+        "wire_megabytes": counters.get("rss.wire_bytes", 0) / 1e6,
+        "too_large": counters.get("rss.too_large", 0),
+        "statuses": {name.split(".")[-1]: value for name, value in counters.items() if name.startswith("http.status.")},
+    }
+
+def _worker(params):
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        feeds = farm_feed_urls(params["port"], params["feeds"], params["hosts"])
+        result = run_load(feeds, params["workers"], params.get("timeout"))
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result["peak_rss_mb"] = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    print(RESULT_MARKER + json.dumps(result))
+
+def _run_in_subprocess(params, verbose):
+    command = [sys.executable, "-m", "benchmarks.load_test", "--worker", json.dumps(params)]
+    result = subprocess.run(command, cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True,
+                            stderr=None if verbose else subprocess.DEVNULL)
+    for line in result.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    raise RuntimeError(f"Load test with {params['workers']} workers failed (exit code {result.returncode})")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the RSS fetcher against the mock feed farm.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32], help="fetch worker counts to compare")
+    parser.add_argument("--feeds", type=int, default=FARM_DEFAULTS["feeds"], help="synthetic feeds served")
+    parser.add_argument("--hosts", type=int, default=FARM_DEFAULTS["hosts"], help="loopback hosts the feeds are spread over")
+    parser.add_argument("--episodes", type=int, default=FARM_DEFAULTS["episodes"], help="episodes per feed")
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default=FARM_DEFAULTS["latency"], help="response latency distribution")
+    parser.add_argument("--latency-ms", type=float, default=FARM_DEFAULTS["latency_ms"], help="fixed value, uniform mean, lognormal median or pareto minimum")
+    parser.add_argument("--latency-shape", type=float, default=FARM_DEFAULTS["latency_shape"], help="lognormal sigma or pareto alpha")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="share of requests that stall for --hang-seconds")
+    parser.add_argument("--hang-seconds", type=float, default=FARM_DEFAULTS["hang_seconds"], help="how long a stalled request stalls")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 5xx")
+    parser.add_argument("--burst-rate", type=float, default=0.0, help="share of hosts answering 503 during each burst window")
+    parser.add_argument("--burst-seconds", type=float, default=FARM_DEFAULTS["burst_seconds"], help="length of a burst window")
+    parser.add_argument("--huge-rate", type=float, default=0.0, help="share of feeds padded to --huge-mb")
+    parser.add_argument("--huge-mb", type=int, default=FARM_DEFAULTS["huge_mb"], help="size of a huge feed in MB")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="share of feeds served as truncated XML")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="share of requests whose connection is dropped")
+    parser.add_argument("--seed", type=int, default=FARM_DEFAULTS["seed"], help="seed for faults and latencies")
+    parser.add_argument("--timeout", type=float, help="override the fetcher's per-request timeout (seconds)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the fetcher's stderr")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        _worker(json.loads(args.worker))
+        return
+
+    config = {
+        "feeds": args.feeds, "hosts": args.hosts, "episodes": args.episodes, "latency": args.latency,
+        "latency_ms": args.latency_ms, "latency_shape": args.latency_shape, "timeout_rate": args.timeout_rate,
+        "hang_seconds": args.hang_seconds, "error_rate": args.error_rate, "burst_rate": args.burst_rate,
+        "burst_seconds": args.burst_seconds, "huge_rate": args.huge_rate, "huge_mb": args.huge_mb,
+        "malformed_rate": args.malformed_rate, "reset_rate": args.reset_rate, "seed": args.seed,
+    }
+    results = []
+    with FeedFarm(**config) as farm:
+        faults = farm.fault_counts()
+        print(f"📡 Feed farm: {args.feeds} feeds on {args.hosts} hosts, "
+              f"{faults['malformed']} malformed, {faults['huge']} huge")
+        for workers in args.workers:
+            params = {"port": farm.port, "feeds": args.feeds, "hosts": args.hosts, "workers": workers, "timeout": args.timeout}
+            result = _run_in_subprocess(params, args.verbose)
+            results.append(result)
+            print(f"⏱️ {workers} workers: {result['feeds_per_sec']:.1f} feeds/s, p99 {result['p99_ms']:.0f} ms")
+
+    print(f"{'workers':>8}{'feeds/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+          f"{'failed':>8}{'invalid':>9}{'retries':>9}{'transient':>11}{'skipped':>9}{'records':>9}{'MB':>8}{'wire MB':>9}{'peak RSS MB':>13}")
+    for r in results:
+        print(f"{r['workers']:>8}{r['feeds_per_sec']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+              f"{r['max_ms']:>10.1f}{r['failed']:>8}{r['invalid']:>9}{r['retries']:>9}{r['transient']:>11}{r['short_circuited']:>9}{r['records']:>9}{r['megabytes']:>8.1f}{r['wire_megabytes']:>9.1f}{r['peak_rss_mb']:>13.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"farm": config, "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
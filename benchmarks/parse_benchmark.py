@@ -0,0 +1,84 @@
+# benchmarks/parse_benchmark.py
+# CPU cost of parsing large feeds the old way (response.text, then feedparser and ElementTree on
+# the decoded string) against parsing the raw bytes, as fetch_rss_feed does now. The feeds are
+# served without a charset in Content-Type, so response.text has to run requests' charset detector.
+#
+#   python -m benchmarks.parse_benchmark --sizes-mb 1 5 20 --repeat 3
+import argparse
+import json
+import statistics
+import time
+import xml.etree.ElementTree as ET
+
+from benchmarks.stub_servers import make_rss_feed
+
+CONTENT_TYPE = "application/rss+xml"
+NAMESPACE = {"itunes": "http://www.itunes.com/dtds/podcast-1.0.dtd"}
+
+def make_large_feed(megabytes):
+    """A synthetic feed of roughly `megabytes` MB, with non-ASCII text as in real feeds."""
+    per_episode = len(make_rss_feed(0, 101)) - len(make_rss_feed(0, 100))
+    feed = make_rss_feed(0, max(1, int(megabytes * 1e6 / per_episode)))
+    return feed.replace(b"Lorem ipsum", "Lörem ïpsum “dolor”".encode("utf-8"))
+
+def _response(body):
+    import requests
+    response = requests.models.Response()
+    response._content = body
+    response.headers["Content-Type"] = CONTENT_TYPE
+    response.encoding = None  # What requests sets for application/* types without a charset
+    return response
+
+def parse_text(body):
+    """The previous path: decode via response.text, then hand the string to both parsers."""
+    import feedparser
+    raw_xml = _response(body).text
+    feedparser.parse(raw_xml)
+    return ET.fromstring(raw_xml).find(".//itunes:owner/itunes:email", NAMESPACE)
+
+def parse_bytes(body):
+    """The current path: both parsers read the bytes and the XML declaration picks the encoding."""
+    import feedparser
+    feedparser.parse(body, response_headers={"content-type": CONTENT_TYPE})
+    return ET.fromstring(body).find(".//itunes:owner/itunes:email", NAMESPACE)
+
+def cpu_seconds(parse, body, repeat):
+    """Median process CPU time of `repeat` parses."""
+    times = []
+    for _ in range(repeat):
+        start = time.process_time()
+        parse(body)
+        times.append(time.process_time() - start)
+    return statistics.median(times)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare parsing feeds from response.text and from raw bytes.")
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 5, 20], help="feed sizes to parse")
+    parser.add_argument("--repeat", type=int, default=3, help="parses per path and size (median CPU time is reported)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for megabytes in args.sizes_mb:
+        body = make_large_feed(megabytes)
+        text_seconds = cpu_seconds(parse_text, body, args.repeat)
+        bytes_seconds = cpu_seconds(parse_bytes, body, args.repeat)
+        results.append({
+            "megabytes": len(body) / 1e6,
+            "text_cpu_ms": text_seconds * 1000,
+            "bytes_cpu_ms": bytes_seconds * 1000,
+            "saved_pct": 100 * (1 - bytes_seconds / text_seconds) if text_seconds else 0.0,
+        })
+        print(f"⏱️ {len(body) / 1e6:.1f} MB: {text_seconds * 1000:.0f} ms from text, {bytes_seconds * 1000:.0f} ms from bytes")
+
+    print(f"{'MB':>8}{'text CPU ms':>14}{'bytes CPU ms':>15}{'saved':>8}")
+    for r in results:
+        print(f"{r['megabytes']:>8.1f}{r['text_cpu_ms']:>14.0f}{r['bytes_cpu_ms']:>15.0f}{r['saved_pct']:>7.0f}%")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
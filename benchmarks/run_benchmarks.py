@@ -0,0 +1,169 @@
+# benchmarks/run_benchmarks.py
+# Offline benchmark suite. Every benchmark runs in a fresh subprocess and scratch directory
+# against the local stub servers, so records/sec and peak RSS are comparable between versions:
+#
+#   python -m benchmarks.run_benchmarks --output before.json
+#   python -m benchmarks.run_benchmarks --output after.json --compare before.json
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.stub_servers import REPO_ROOT, RAW_DATA_DIR, StubServer
+
+BENCHMARKS = ["extract_raw", "itunes_build_data", "rss_fetch", "podchaser_fetch", "save_to_excel"]
+RESULT_MARKER = "BENCHMARK_RESULT "
+
+def _prepare_workspace(feeds=()):
+    """Switch into a scratch directory holding its own rss_feed.py, logs and checkpoints."""
+    workspace = tempfile.mkdtemp(prefix="podcast-bench-")
+    os.chdir(workspace)
+    with open("rss_feed.py", "w", encoding="utf-8") as f:
+        f.write("RSS_FEEDS = [\n" + "".join(f'    "{url}",\n' for url in feeds) + "]\n")
+    # The scratch rss_feed.py must shadow the repository one, for imports and reloads alike
+    sys.path.insert(0, workspace)
+    return workspace
+
+def _synthetic_records(count):
+    from records import PodcastRecords
+    records = PodcastRecords()
+    for i in range(count):
+        records.append({
+            "id": str(i), "title": f"Show {i}", "description": f"Description of show {i}",
+            "url": f"http://show{i}.example.org/", "webUrl": f"http://show{i}.example.org/",
+            "rssUrl": f"http://show{i}.example.org/feed", "imageUrl": "N/A", "language": "en",
+            "numberOfEpisodes": i % 300, "startDate": "N/A", "latestEpisodeDate": "2024-01-01",
+            "categories": None, "author_name": f"Host {i}", "author_email": f"host{i}@show{i}.org",
+            "source": "Podchaser" if i % 2 else "RSS Feed",
+        })
+    return records
+
+def run_benchmark(name, base_url, params):
+    """Run one benchmark in this process and return (records, seconds)."""
+    if name == "extract_raw":
+        _prepare_workspace()
+        import extract_raw_data
+        extract_raw_data.RAW_DATA_DIR = RAW_DATA_DIR
+        start = time.perf_counter()
+        records = len(extract_raw_data.extract_rss_urls_from_raw())
+    elif name == "itunes_build_data":
+        _prepare_workspace()
+        from build_dataset import BuildDataset
+        builder = BuildDataset(mode="alphabet", base_url=f"{base_url}/itunes/search")
+        start = time.perf_counter()
+        records = len(builder.build_data())
+    elif name == "rss_fetch":
+        feeds = [f"{base_url}/rss/{i}.xml" for i in range(params["feeds"])]
+        _prepare_workspace(feeds)
+        import fetch
+        start = time.perf_counter()
+        records = len(fetch.fetch_rss_feed_data(feeds))
+    elif name == "podchaser_fetch":
+        _prepare_workspace()
+        import fetch
+        start = time.perf_counter()
+        records = len(fetch.fetch_podchaser_data(f"{base_url}/graphql"))
+    elif name == "save_to_excel":
+        _prepare_workspace()
+        import fetch
+        data = _synthetic_records(params["excel_rows"])
+        start = time.perf_counter()
+        fetch.save_to_excel(data, "bench.xlsx")
+        records = len(data)
+    else:
+        raise ValueError(f"Unknown benchmark: {name}")
+    return records, time.perf_counter() - start
+
+def _worker(name, base_url, params):
+    with contextlib.redirect_stdout(io.StringIO()):
+        records, seconds = run_benchmark(name, base_url, params)
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    print(RESULT_MARKER + json.dumps({"records": records, "seconds": seconds, "peak_rss_mb": peak_mb}))
+
+def _run_in_subprocess(name, base_url, params, verbose):
+    command = [sys.executable, "-m", "benchmarks.run_benchmarks", "--worker", name,
+               "--base-url", base_url, "--params", json.dumps(params)]
+    result = subprocess.run(command, cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True,
+                            stderr=None if verbose else subprocess.DEVNULL)
+    for line in result.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    raise RuntimeError(f"Benchmark {name} failed (exit code {result.returncode})")
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip()
+    except OSError:
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; the median is reported")
+    parser.add_argument("--feeds", type=int, default=300, help="synthetic RSS feeds for rss_fetch")
+    parser.add_argument("--episodes", type=int, default=50, help="episodes per synthetic RSS feed")
+    parser.add_argument("--rss-latency-ms", type=int, default=0, help="stub latency per RSS response")
+    parser.add_argument("--podcasts", type=int, default=2000, help="podcasts served by the fake GraphQL endpoint")
+    parser.add_argument("--excel-rows", type=int, default=20000, help="records written by save_to_excel")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results from a previous run to compare against")
+    parser.add_argument("--verbose", action="store_true", help="show the benchmarked code's stderr")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--params", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        _worker(args.worker, args.base_url, json.loads(args.params))
+        return
+
+    params = {"feeds": args.feeds, "excel_rows": args.excel_rows}
+    config = {"rss_episodes": args.episodes, "rss_latency_ms": args.rss_latency_ms, "podchaser_podcasts": args.podcasts}
+    results = {}
+    with StubServer(**config) as stub:
+        for name in args.only or BENCHMARKS:
+            runs = [_run_in_subprocess(name, stub.base_url, params, args.verbose) for _ in range(args.repeat)]
+            seconds = statistics.median(run["seconds"] for run in runs)
+            records = runs[0]["records"]
+            results[name] = {
+                "records": records,
+                "seconds": seconds,
+                "records_per_sec": records / seconds if seconds else 0.0,
+                "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+            }
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+    print(f"{'benchmark':<20}{'records':>10}{'seconds':>10}{'records/s':>12}{'peak RSS MB':>13}{'vs baseline':>13}")
+    for name, r in results.items():
+        change = ""
+        if name in baseline and baseline[name]["records_per_sec"]:
+            change = f"{r['records_per_sec'] / baseline[name]['records_per_sec']:.2f}x"
+        print(f"{name:<20}{r['records']:>10}{r['seconds']:>10.2f}{r['records_per_sec']:>12.1f}{r['peak_rss_mb']:>13.1f}{change:>13}")
+
+    if args.output:
+        report = {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "parameters": {**params, **config, "repeat": args.repeat},
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
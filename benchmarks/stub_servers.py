@@ -0,0 +1,150 @@
+# benchmarks/stub_servers.py
+# Local stand-ins for the services the build talks to:
+#   /itunes/search?term=x   the checked-in raw_data JSON for that term, served as an iTunes response
+#   /rss/<n>.xml            synthetic RSS feed n (configurable episode count and latency)
+#   /graphql                fake Podchaser GraphQL endpoint with a configurable number of podcasts
+# The server runs in a separate process so it neither competes with the code under test
+# for the GIL nor shows up in its peak RSS.
+import glob
+import json
+import multiprocessing
+import os
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW_DATA_DIR = os.path.join(REPO_ROOT, "raw_data")
+
+DEFAULT_CONFIG = {
+    "rss_episodes": 50,        # <item> elements per synthetic feed
+    "rss_latency_ms": 0,       # Delay before each RSS response
+    "podchaser_podcasts": 1000,
+    "podchaser_latency_ms": 0,
+    "itunes_latency_ms": 0,
+}
+
+def make_rss_feed(index, episodes, email=True):
+    """Return the bytes of a deterministic synthetic podcast feed."""
+    owner = f"<itunes:owner><itunes:name>Host {index}</itunes:name><itunes:email>host{index}@podcast{index % 97}.org</itunes:email></itunes:owner>" if email else ""
+    items = "".join(
+        f"<item><title>Episode {e} of show {index}</title>"
+        f"<description>Synthetic episode {e} description for benchmark feed {index}. {'Lorem ipsum dolor sit amet. ' * 4}</description>"
+        f"<enclosure url=\"http://media.example.org/{index}/{e}.mp3\" length=\"{1000000 + e}\" type=\"audio/mpeg\"/>"
+        f"<guid>show-{index}-episode-{e}</guid>"
+        f"<pubDate>Mon, {1 + e % 28:02d} Jan 2024 10:00:00 +0000</pubDate></item>"
+        for e in range(episodes)
+    )
+    return (
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        "<rss version=\"2.0\" xmlns:itunes=\"http://www.itunes.com/dtds/podcast-1.0.dtd\"><channel>"
+        f"<title>Benchmark show {index}</title><link>http://show{index}.example.org/</link>"
+        f"<description>Synthetic show {index}</description><language>en</language>"
+        f"<itunes:author>Host {index}</itunes:author>{owner}{items}</channel></rss>"
+    ).encode("utf-8")
+
+def _latest_raw_files():
+    """Map each search term to the newest raw_data file for it."""
+    files = {}
+    for path in sorted(glob.glob(os.path.join(RAW_DATA_DIR, "*.json"))):
+        files[os.path.basename(path).split("_")[0]] = path
+    return files
+
+def _podchaser_page(page, total):
+    start = page * 100
+    data = [
+        {
+            "id": str(i), "title": f"Podchaser show {i}", "rssUrl": f"http://show{i}.example.org/feed",
+            "imageUrl": f"http://img.example.org/{i}.jpg", "language": "en", "numberOfEpisodes": i % 300,
+            "startDate": "2020-01-01", "latestEpisodeDate": "2024-01-01",
+            "author": {"name": f"Author {i}", "email": f"author{i}@show{i}.org" if i % 4 else ""},
+        }
+        for i in range(start, min(start + 100, total))
+    ]
+    return {"data": {"podcasts": {"data": data}}}
+
+def make_handler(config):
+    raw_files = _latest_raw_files()
+    feed_cache = {}
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, Nagle plus delayed ACK adds ~40ms per response
+        disable_nagle_algorithm = True
+
+        def _send(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == "/itunes/search":
+                time.sleep(config["itunes_latency_ms"] / 1000)
+                term = parse_qs(parts.query).get("term", [""])[0]
+                path = raw_files.get(term)
+                if path is None:
+                    self._send(200, b'{"resultCount": 0, "results": []}', "application/json")
+                    return
+                with open(path, "rb") as f:
+                    self._send(200, f.read(), "text/javascript; charset=utf-8")
+                return
+            match = re.fullmatch(r"/rss/(\d+)\.xml", parts.path)
+            if match:
+                time.sleep(config["rss_latency_ms"] / 1000)
+                index = int(match.group(1))
+                if index not in feed_cache:
+                    feed_cache[index] = make_rss_feed(index, config["rss_episodes"])
+                self._send(200, feed_cache[index], "application/rss+xml")
+                return
+            self._send(404, b"not found", "text/plain")
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if urlsplit(self.path).path != "/graphql":
+                self._send(404, b"not found", "text/plain")
+                return
+            time.sleep(config["podchaser_latency_ms"] / 1000)
+            query = json.loads(body).get("query", "")
+            page = int(re.search(r"page:\s*(\d+)", query).group(1))
+            self._send(200, json.dumps(_podchaser_page(page, config["podchaser_podcasts"])).encode(), "application/json")
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+def _serve(config, port_queue):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(config))
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+class StubServer:
+    """Run the stub services in a child process; use as a context manager."""
+    def __init__(self, **config):
+        self.config = {**DEFAULT_CONFIG, **config}
+        self.process = None
+        self.port = None
+
+    def __enter__(self):
+        port_queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=_serve, args=(self.config, port_queue), daemon=True)
+        self.process.start()
+        self.port = port_queue.get(timeout=10)
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join()
+        return False
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def rss_urls(self, count):
+        return [f"{self.base_url}/rss/{i}.xml" for i in range(count)]
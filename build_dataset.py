@@ -1,13 +1,14 @@
 # build_dataset.py
-import requests
-import pandas as pd
 import os
 from datetime import datetime
 import json
 import string
 import itertools
 
+import instrumentation
+
 RAW_DATA_DIR = "raw_data"
+ITUNES_SEARCH_URL = "https://itunes.apple.com/search"
 
 def save_raw_response(term, data):
     """Save raw JSON response to a file for the given search term."""
@@ -33,7 +34,7 @@ class BuildDataset:
     The default mode is "alphabet", which generates search terms from the letters a–z.
     You may increase the combination length (n) to get more granular queries.
     """
-    def __init__(self, mode="alphabet", terms=None, n=1):
+    def __init__(self, mode="alphabet", terms=None, n=1, base_url=ITUNES_SEARCH_URL):
         if mode == "alphabet":
             # If terms are provided, use them; otherwise, generate n-letter combinations.
             if terms is None:
@@ -43,36 +44,56 @@ class BuildDataset:
         else:
             self.terms = terms if terms is not None else []
         self.rows = []  # List to hold each podcast's data as a dictionary
+        self.base_url = base_url
 
-    def build_data(self):
-        base_url = "https://itunes.apple.com/search"
-        for term in self.terms:
-            params = {
-                "term": term,
-                "limit": 200,  # Maximum results per query
-                "country": "US",
-                "entity": "podcast"
+    def fetch_term(self, term):
+        """Query the iTunes Search API for one term and return one row dict per podcast result."""
+        params = {
+            "term": term,
+            "limit": 200,  # Maximum results per query
+            "country": "US",
+            "entity": "podcast"
+        }
+        import requests
+        with instrumentation.timer("itunes.request"):
+            response = requests.get(self.base_url, params=params)
+        instrumentation.count(f"http.status.{response.status_code}")
+        instrumentation.count("itunes.bytes", len(response.content))
+        with instrumentation.timer("itunes.parse_json"):
+            data = response.json()
+        with instrumentation.timer("itunes.save_raw"):
+            save_raw_response(term, data)
+        result_count = data.get("resultCount", 0)
+        print(f"Term '{term}': {result_count} results")
+        rows = []
+        for result in data.get("results", []):
+            row = {
+                "Name": result.get("collectionName", "N/A"),
+                "Artwork": result.get("artworkUrl100", "N/A"),
+                "Episode Count": result.get("trackCount", 0),
+                "GenreIDs": ", ".join(map(str, result.get("genreIds", []))) if result.get("genreIds") else "N/A",
+                "iTunes URL": result.get("collectionViewUrl", result.get("trackViewUrl", "N/A")),
+                "rssUrl": result.get("feedUrl", "N/A"),
+                # iTunes API does not provide email contact information
+                "author_email": "N/A"
             }
+            rows.append(row)
+        return rows
+
+    def iter_rows(self):
+        """Yield one row dict per podcast result, querying the iTunes Search API term by term."""
+        for term in self.terms:
             try:
-                response = requests.get(base_url, params=params)
-                data = response.json()
-                save_raw_response(term, data)
-                result_count = data.get("resultCount", 0)
-                print(f"Term '{term}': {result_count} results")
-                for result in data.get("results", []):
-                    row = {
-                        "Name": result.get("collectionName", "N/A"),
-                        "Artwork": result.get("artworkUrl100", "N/A"),
-                        "Episode Count": result.get("trackCount", 0),
-                        "GenreIDs": ", ".join(map(str, result.get("genreIds", []))) if result.get("genreIds") else "N/A",
-                        "iTunes URL": result.get("collectionViewUrl", result.get("trackViewUrl", "N/A")),
-                        "rssUrl": result.get("feedUrl", "N/A"),
-                        # iTunes API does not provide email contact information
-                        "author_email": "N/A"
-                    }
-                    self.rows.append(row)
+                rows = self.fetch_term(term)
             except Exception as e:
                 print(f"Error fetching data for term '{term}': {e}")
+                continue
+            yield from rows
+
+    def build_data(self):
+        for row in self.iter_rows():
+            self.rows.append(row)
+        import pandas as pd
         legacy_df = pd.DataFrame(self.rows)
         legacy_df.drop_duplicates(inplace=True)
         return legacy_df
@@ -0,0 +1,94 @@
+# checkpoint.py
+import json
+import os
+import time
+
+CHECKPOINT_DIR = "checkpoints"
+CHECKPOINT_INTERVAL = 50        # Completed items buffered between writes
+CHECKPOINT_MAX_AGE_HOURS = 24   # Older checkpoints are discarded instead of resumed
+
+class Checkpoint:
+    """
+    Resumable progress of one fetch stage: the completed work items (pages, terms, feeds)
+    and the records they produced, appended to checkpoints/<stage>.jsonl.
+
+    Use as a context manager: a stage that finishes cleanly deletes its checkpoint, one that
+    is interrupted, fails or calls keep() flushes it so the next run resumes from there.
+    """
+    def __init__(self, stage, interval=CHECKPOINT_INTERVAL, directory=CHECKPOINT_DIR):
+        self.stage = stage
+        self.interval = interval
+        self.path = os.path.join(directory, f"{stage}.jsonl")
+        self.results = []
+        self._done = set()
+        self._pending = []
+        self._keep = False
+        self.load()
+
+    def load(self):
+        """Load a previous checkpoint for this stage, if a recent one exists."""
+        if not os.path.exists(self.path):
+            return
+        age_hours = (time.time() - os.path.getmtime(self.path)) / 3600
+        if age_hours > CHECKPOINT_MAX_AGE_HOURS:
+            print(f"Discarding {age_hours:.0f}h old checkpoint for {self.stage}.")
+            self.clear()
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash; everything before it is intact
+                    break
+                self._done.add(entry["item"])
+                self.results.extend(entry.get("results", []))
+        print(f"♻️ Resuming {self.stage}: {len(self._done)} items and {len(self.results)} records from checkpoint.")
+
+    def is_done(self, item):
+        return item in self._done
+
+    @property
+    def completed(self):
+        """The set of items already completed (including those resumed from disk)."""
+        return set(self._done)
+
+    def mark_done(self, item, results=()):
+        """Record a completed item and its records; written to disk every `interval` items."""
+        results = list(results)
+        self._done.add(item)
+        self._pending.append({"item": item, "results": results})
+        if len(self._pending) >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Append the buffered items to the checkpoint file."""
+        if not self._pending:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in self._pending:
+                f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending = []
+
+    def keep(self):
+        """Keep the checkpoint even if the stage ends normally (some items failed and should be retried)."""
+        self._keep = True
+
+    def clear(self):
+        """Delete the checkpoint once the stage has finished."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None and not self._keep:
+            self.clear()
+        else:
+            self.flush()
+        return False
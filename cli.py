@@ -0,0 +1,329 @@
+# cli.py
+# Run the build as a whole or one stage at a time:
+#
+#   python cli.py podchaser     Podchaser API           -> artifacts/podchaser.jsonl
+#   python cli.py itunes        iTunes alphabet search  -> artifacts/itunes.jsonl
+#   python cli.py rss           feeds in rss_feed.py    -> artifacts/rss.jsonl
+#   python cli.py extract-raw   raw_data/ feed URLs     -> rss_feed.py and artifacts/extract-raw.jsonl
+#   python cli.py merge         source artifacts        -> artifacts/merged.jsonl
+#   python cli.py export        artifacts/merged.jsonl  -> podcasts_data.xlsx
+#   python cli.py full          everything, streamed concurrently (same as `python fetch.py`)
+#   python cli.py build [stage] a stage and the stages it depends on, make-style
+#   python cli.py schedule      each source on its own cadence (see scheduler.py)
+#
+# extract-raw, merge and export are memoized: they are skipped when their inputs, parameters and
+# code are unchanged since the last run and their output is untouched (see pipeline_cache.py).
+import argparse
+import itertools
+import os
+import time
+
+import artifacts
+import email_validation
+import fetch
+import instrumentation
+import merge_records
+import podcast_store
+import profiling
+import records
+import scheduler
+from crawl_budget import make_budget
+from build_dataset import BuildDataset
+import extract_raw_data
+import feed_registry
+import feed_urls
+from feed_redirects import REDIRECTS_FILE
+from metrics_export import write_metrics
+from pipeline_cache import StageCache
+from pipeline import STREAM_BATCH_SIZE, batched
+from podcast_store import PodcastStore
+from records import PodcastRecords
+
+SOURCE_STAGES = ["podchaser", "itunes", "rss"]  # Stages whose artifacts `merge` reads by default
+MERGE_STORE = os.path.join(artifacts.ARTIFACT_DIR, "merge.db")
+
+# Stage -> the stages whose outputs it reads; `build` runs them in this order
+STAGE_DEPENDENCIES = {
+    "podchaser": [],
+    "itunes": [],
+    "extract-raw": ["itunes"],    # itunes archives the raw responses
+    "rss": ["extract-raw"],       # extract-raw registers the feeds
+    "merge": ["podchaser", "itunes", "rss"],
+    "export": ["merge"],
+}
+FETCH_STAGES = ["podchaser", "itunes", "rss"]  # Depend on remote data, so never memoized
+SELF_PROFILED_STAGES = {"build"}  # Profile each stage they run; an outer profiler would be displaced by theirs
+# Fetch stage -> the source label the full build uses (see run_pipeline), so metrics match across both paths
+SOURCE_LABELS = {
+    "podchaser": merge_records.SOURCE_PODCHASER,
+    "itunes": merge_records.SOURCE_ITUNES,
+    "rss": merge_records.SOURCE_RSS,
+}
+# Options that do not change a stage's output
+UNCACHED_OPTIONS = {"run", "stage", "profile", "profile_dir", "profile_top", "force", "targets", "refresh"}
+
+def _limited(records, limit):
+    return itertools.islice(records, limit) if limit else records
+
+def _write_source(stage, path, records):
+    """Write a fetch stage's artifact, timed and counted as source.<label> / records.<label> like the full build."""
+    label = SOURCE_LABELS[stage]
+    start = time.perf_counter()
+    try:
+        count = artifacts.write_records(path, records)
+    finally:
+        instrumentation.record_time(f"source.{label}", time.perf_counter() - start)
+    instrumentation.count(f"records.{label}", count)
+    return count
+
+def run_podchaser(args):
+    records = fetch.iter_podchaser_records(args.api_url)
+    return _write_source("podchaser", args.output, _limited(records, args.limit))
+
+def run_itunes(args):
+    terms = BuildDataset(mode="alphabet", n=args.letters).terms[:args.limit or None]
+    records = fetch.iter_legacy_records(terms, args.workers)
+    return _write_source("itunes", args.output, records)
+
+def run_rss(args):
+    feeds = feed_registry.load_feeds()[:args.limit or None]
+    print(f"Loaded {len(feeds)} RSS feeds from {fetch.RSS_FEED_FILE}")
+    budget = make_budget(args.budget_minutes, args.budget_mb)
+    records = fetch.iter_rss_feed_records(feeds, args.workers, only_due=not args.all, budget=budget,
+                                         parse_workers=args.parse_workers)
+    return _write_source("rss", args.output, records)
+
+def run_extract_raw(args):
+    urls = extract_raw_data.extract_rss_urls_from_raw()[:args.limit or None]
+    print(f"Extracted {len(urls)} RSS URLs from raw data.")
+    if not args.no_register:
+        added, total = feed_registry.add_feeds(urls)
+        print(f"{feed_registry.RSS_FEED_FILE} updated with {total} RSS feeds ({len(added)} new).")
+    return artifacts.write_records(args.output, ({"rssUrl": url} for url in urls))
+
+def _merge_inputs(args):
+    return args.inputs or [path for path in map(artifacts.artifact_path, SOURCE_STAGES) if os.path.exists(path)]
+
+def run_merge(args):
+    inputs = _merge_inputs(args)
+    if not inputs:
+        raise SystemExit("❌ No source artifacts to merge; run podchaser, itunes or rss first.")
+    # A fresh store, so only the given artifacts are merged
+    if os.path.exists(args.store):
+        os.remove(args.store)
+    store = PodcastStore(args.store)
+    try:
+        # The artifacts are local files, so they are loaded one after another rather than streamed concurrently
+        for path in inputs:
+            name = os.path.splitext(os.path.basename(path))[0]
+            count = sum(store.add_batch(batch) for batch in batched(artifacts.iter_records(path), STREAM_BATCH_SIZE))
+            # Not records.<label>: those count what a source delivered, which the fetch stage already did
+            instrumentation.count(f"merge.loaded.{SOURCE_LABELS.get(name, name)}", count)
+            print(f"⏱️ {name}: {count} records loaded from {path}")
+        with instrumentation.timer("store.merge"):
+            count = artifacts.write_records(args.output, _limited(store.iter_merged(), args.limit))
+        instrumentation.count("records.merged", count)
+    finally:
+        store.close()
+    return count
+
+def run_export(args):
+    data = PodcastRecords(_limited(artifacts.iter_records(args.input), args.limit))
+    fetch.save_to_excel(data, args.output)
+    return len(data)
+
+def run_full(args):
+    fetch.run_build(args.output, args.workers, args.itunes_workers, make_budget(args.budget_minutes, args.budget_mb),
+                    args.parse_workers)
+
+# Memoized stage -> its input files: data, configuration and the modules holding its code
+CACHE_INPUTS = {
+    "extract-raw": lambda args: [extract_raw_data.RAW_DATA_DIR, extract_raw_data.__file__, feed_urls.__file__],
+    "merge": lambda args: _merge_inputs(args) + [REDIRECTS_FILE, merge_records.__file__, podcast_store.__file__, records.__file__],
+    "export": lambda args: [args.input, fetch.__file__, email_validation.__file__, records.__file__, feed_urls.__file__],
+}
+
+def _stage_params(args):
+    params = {key: value for key, value in vars(args).items() if key not in UNCACHED_OPTIONS}
+    if args.stage == "merge":
+        params.update(field_precedence=merge_records.FIELD_PRECEDENCE,
+                      default_precedence=merge_records.DEFAULT_SOURCE_PRECEDENCE)
+    elif args.stage == "export":
+        params.update(check_domains=email_validation.CHECK_EMAIL_DOMAINS,
+                      placeholder_domains=sorted(email_validation.PLACEHOLDER_DOMAINS))
+    return params
+
+def execute(args, cache=None):
+    """Run a stage; memoized stages are skipped when their cache key and output are unchanged."""
+    inputs_for = CACHE_INPUTS.get(args.stage)
+    if inputs_for is None:
+        return args.run(args)
+    cache = cache or StageCache()
+    key = cache.stage_key(args.stage, inputs_for(args), _stage_params(args))
+    fresh = not args.force and cache.is_fresh(args.stage, key, [args.output])
+    cache.flush()
+    if fresh:
+        print(f"♻️ {args.stage} is up to date: inputs unchanged since its last run ({args.output}).")
+        instrumentation.count("stages.skipped")
+        return None
+    result = args.run(args)
+    cache.save(args.stage, key, [args.output])
+    instrumentation.count("stages.run")
+    return result
+
+def _plan(targets):
+    """The targets and their dependencies, each after the stages it depends on."""
+    order = []
+    def visit(stage):
+        if stage in order:
+            return
+        for dependency in STAGE_DEPENDENCIES[stage]:
+            visit(dependency)
+        order.append(stage)
+    for target in targets:
+        visit(target)
+    return order
+
+def run_graph(args):
+    """Run the targets' stage graph. Fetch stages run only when their artifact is missing or refreshed."""
+    unknown = [target for target in args.targets if target not in STAGE_DEPENDENCIES]
+    if unknown:
+        raise SystemExit(f"❌ Unknown stage(s): {', '.join(unknown)}")
+    parser = build_parser()
+    cache = StageCache()
+    for name in _plan(args.targets or ["export"]):
+        stage_args = parser.parse_args([name])
+        stage_args.force = args.force
+        if name in FETCH_STAGES and name not in args.refresh and os.path.exists(stage_args.output):
+            print(f"♻️ Using {stage_args.output} from an earlier run (--refresh {name} fetches it again).")
+            continue
+        print(f"▶️ Stage {name}")
+        with profiling.profile_stage(name):
+            execute(stage_args, cache)
+
+def run_schedule(args):
+    intervals = {"podchaser": args.podchaser_hours * 3600, "rss": args.rss_hours * 3600, "itunes": args.itunes_hours * 3600}
+    scheduler.run_scheduler(intervals, once=args.once)
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--profile", action="store_true",
+                        help="profile each stage with cProfile and save the stats and hot-function summaries")
+    common.add_argument("--profile-dir", default=profiling.PROFILE_DIR, help="directory for profile output")
+    common.add_argument("--profile-top", type=int, default=profiling.PROFILE_TOP_N,
+                        help="number of functions in each hot-function summary")
+
+    parser = argparse.ArgumentParser(description="Build the podcast database, or run one stage of the build.")
+    stages = parser.add_subparsers(dest="stage", required=True)
+
+    stage = stages.add_parser("podchaser", parents=[common], help="fetch podcasts from the Podchaser API")
+    stage.add_argument("--limit", type=int, help="stop after this many records")
+    stage.add_argument("--api-url", help="GraphQL endpoint (default: the Podchaser API)")
+    stage.add_argument("--output", default=artifacts.artifact_path("podchaser"), help="JSONL artifact to write")
+    stage.set_defaults(run=run_podchaser)
+
+    stage = stages.add_parser("itunes", parents=[common], help="search iTunes term by term and archive raw responses")
+    stage.add_argument("--workers", type=int, default=fetch.ITUNES_FETCH_WORKERS, help="concurrent iTunes searches")
+    stage.add_argument("--limit", type=int, help="search only the first N terms")
+    stage.add_argument("--letters", type=int, default=1, help="letters per search term (1 = a-z, 2 = aa-zz)")
+    stage.add_argument("--output", default=artifacts.artifact_path("itunes"), help="JSONL artifact to write")
+    stage.set_defaults(run=run_itunes)
+
+    stage = stages.add_parser("rss", parents=[common], help="fetch and validate the feeds registered in rss_feed.py")
+    stage.add_argument("--workers", type=int, default=fetch.RSS_FETCH_WORKERS, help="concurrent RSS downloads")
+    stage.add_argument("--parse-workers", type=int, default=fetch.RSS_PARSE_WORKERS, help="RSS feed parsing processes (1 = parse in-process)")
+    stage.add_argument("--limit", type=int, help="fetch only the first N registered feeds")
+    stage.add_argument("--all", action="store_true", help="fetch every feed, also those not due for a revisit")
+    stage.add_argument("--budget-minutes", type=float, help="stop fetching after this many minutes; most important feeds first")
+    stage.add_argument("--budget-mb", type=float, help="stop fetching after downloading this many MB")
+    stage.add_argument("--output", default=artifacts.artifact_path("rss"), help="JSONL artifact to write")
+    stage.set_defaults(run=run_rss)
+
+    stage = stages.add_parser("extract-raw", parents=[common], help="register the feed URLs found in raw_data/")
+    stage.add_argument("--limit", type=int, help="take only the first N URLs")
+    stage.add_argument("--no-register", action="store_true", help="write the artifact without updating rss_feed.py")
+    stage.add_argument("--output", default=artifacts.artifact_path("extract-raw"), help="JSONL artifact to write")
+    stage.add_argument("--force", action="store_true", help="run even if the inputs are unchanged")
+    stage.set_defaults(run=run_extract_raw)
+
+    stage = stages.add_parser("merge", parents=[common], help="merge source artifacts into one record per podcast")
+    stage.add_argument("inputs", nargs="*", help=f"source artifacts (default: the existing {', '.join(SOURCE_STAGES)} artifacts)")
+    stage.add_argument("--limit", type=int, help="write only the first N merged records")
+    stage.add_argument("--store", default=MERGE_STORE, help="SQLite file used for the merge (recreated on each run)")
+    stage.add_argument("--output", default=artifacts.artifact_path("merged"), help="JSONL artifact to write")
+    stage.add_argument("--force", action="store_true", help="run even if the inputs are unchanged")
+    stage.set_defaults(run=run_merge)
+
+    stage = stages.add_parser("export", parents=[common], help="validate merged records and update the Excel file")
+    stage.add_argument("--input", default=artifacts.artifact_path("merged"), help="JSONL artifact to export")
+    stage.add_argument("--limit", type=int, help="export only the first N records")
+    stage.add_argument("--output", default=fetch.EXCEL_FILENAME, help="Excel file to update")
+    stage.add_argument("--force", action="store_true", help="run even if the inputs are unchanged")
+    stage.set_defaults(run=run_export)
+
+    stage = stages.add_parser("full", parents=[common], help="run every stage, streaming the sources concurrently")
+    stage.add_argument("--workers", type=int, default=fetch.RSS_FETCH_WORKERS, help="concurrent RSS downloads")
+    stage.add_argument("--parse-workers", type=int, default=fetch.RSS_PARSE_WORKERS, help="RSS feed parsing processes (1 = parse in-process)")
+    stage.add_argument("--itunes-workers", type=int, default=fetch.ITUNES_FETCH_WORKERS, help="concurrent iTunes searches")
+    stage.add_argument("--budget-minutes", type=float, help="RSS crawl time budget; most important feeds first")
+    stage.add_argument("--budget-mb", type=float, help="RSS crawl download budget")
+    stage.add_argument("--output", default=fetch.EXCEL_FILENAME, help="Excel file to update")
+    stage.set_defaults(run=run_full)
+
+    stage = stages.add_parser("build", parents=[common], help="run stages and their dependencies, skipping unchanged ones")
+    stage.add_argument("targets", nargs="*", metavar="stage",
+                       help=f"stages to bring up to date: {', '.join(STAGE_DEPENDENCIES)} (default: export)")
+    stage.add_argument("--refresh", nargs="+", choices=FETCH_STAGES, default=[],
+                       help="fetch these sources again even if their artifacts exist")
+    stage.add_argument("--force", action="store_true", help="re-run memoized stages even if their inputs are unchanged")
+    stage.set_defaults(run=run_graph)
+
+    stage = stages.add_parser("schedule", help="fetch each source on its own interval and refresh the export after it")
+    stage.add_argument("--podchaser-hours", type=float, default=scheduler.SOURCE_INTERVALS["podchaser"] / 3600, help="Podchaser interval")
+    stage.add_argument("--rss-hours", type=float, default=scheduler.SOURCE_INTERVALS["rss"] / 3600, help="RSS revalidation interval")
+    stage.add_argument("--itunes-hours", type=float, default=scheduler.SOURCE_INTERVALS["itunes"] / 3600, help="iTunes crawl interval")
+    stage.add_argument("--once", action="store_true", help="run the jobs that are due and exit (for cron)")
+    stage.set_defaults(run=run_schedule, profile=False)
+    return parser
+
+def run_stages(stage_args, job=None):
+    """
+    Run stages one after another as a single build: one timing summary (and profile, when enabled)
+    and one Prometheus metrics file, written with success=0 if a stage raises. A scheduler `job`
+    gets its own metrics file, labelled with the job (see metrics_export.write_metrics).
+    """
+    instrumentation.reset()
+    success = False
+    try:
+        for args in stage_args:
+            if args.stage in SELF_PROFILED_STAGES:
+                execute(args)
+                continue
+            with profiling.profile_stage(args.stage):
+                execute(args)
+        success = True
+    finally:
+        summary = instrumentation.print_summary()
+        write_metrics(summary, success, job=job)
+        if profiling.is_enabled():
+            profiling.write_summary()
+
+def run_stage(args):
+    """Run one stage with its own timing summary and metrics file."""
+    run_stages([args])
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        profiling.enable(args.profile_dir, args.profile_top)
+    if args.stage == "schedule":
+        # Every job runs its stages as one build, with one summary and metrics file
+        run_schedule(args)
+    elif args.stage == "full":
+        # run_build prints its own summary and writes the metrics file
+        run_full(args)
+    else:
+        run_stage(args)
+
+if __name__ == "__main__":
+    main()
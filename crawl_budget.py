@@ -0,0 +1,101 @@
+# crawl_budget.py
+import math
+import os
+import threading
+import time
+
+import extract_raw_data
+from feed_urls import canonicalize_feed_url
+from json_store import load_json, write_json
+
+CRAWL_BACKLOG_FILE = "crawl_backlog.json"
+
+# Weights of the feed priority score terms
+PRIORITY_WEIGHTS = {
+    "staleness": 1.0,   # How far past its revisit interval a feed is (capped at MAX_STALENESS)
+    "email": 1.0,       # 1 if the feed's last record had an email, 0.5 if unknown
+    "popularity": 1.0,  # log10 of the iTunes trackCount, divided by 3
+    "backlog": 2.0,     # Left over by the previous, budget-limited run
+}
+MAX_STALENESS = 5.0
+NEVER_FETCHED_STALENESS = 2.0
+
+class CrawlBudget:
+    """
+    Wall-clock and download limits for one crawl. Shared by the fetch workers, so it is
+    thread-safe; a limit of None means unlimited.
+    """
+    def __init__(self, max_seconds=None, max_bytes=None):
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.start = time.perf_counter()
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def spend(self, nbytes):
+        with self._lock:
+            self.bytes += nbytes
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def exhausted(self):
+        if self.max_seconds is not None and self.elapsed() >= self.max_seconds:
+            return True
+        with self._lock:
+            return self.max_bytes is not None and self.bytes >= self.max_bytes
+
+    def describe(self):
+        return f"{self.elapsed():.0f}s, {self.bytes / 1e6:.1f} MB"
+
+def make_budget(minutes=None, megabytes=None):
+    """A CrawlBudget for the given limits, or None when neither is set."""
+    if minutes is None and megabytes is None:
+        return None
+    return CrawlBudget(minutes * 60 if minutes is not None else None,
+                       megabytes * 1e6 if megabytes is not None else None)
+
+def load_popularity():
+    """Canonical feed URL -> iTunes trackCount, from the archived raw iTunes responses."""
+    popularity = {}
+    for dataset in extract_raw_data.load_all_raw_data():
+        for result in dataset.get("results", []):
+            feed = result.get("feedUrl")
+            if feed:
+                key = canonicalize_feed_url(feed)
+                popularity[key] = max(popularity.get(key, 0), result.get("trackCount") or 0)
+    return popularity
+
+def load_backlog(path=CRAWL_BACKLOG_FILE):
+    """Feeds a budget-limited run did not reach."""
+    return load_json(path, {}).get("feeds", [])
+
+def save_backlog(feeds, path=CRAWL_BACKLOG_FILE):
+    """Persist the unreached feeds for the next run; an empty backlog removes the file."""
+    if not feeds:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    write_json(path, {"saved": time.time(), "feeds": feeds}, indent=2)
+
+def priority_score(url, feed_schedule, popularity, backlog_keys, now):
+    key = canonicalize_feed_url(url)
+    entry = feed_schedule.entry(url)
+    if entry and "last_fetched" in entry:
+        staleness = (now - entry.get("last_fetched", now)) / max(entry.get("interval", 1), 1)
+        record = entry.get("record") or {}
+        email = 1.0 if record.get("author_email") not in (None, "", "N/A") else 0.0
+    else:
+        staleness, email = NEVER_FETCHED_STALENESS, 0.5
+    return (PRIORITY_WEIGHTS["staleness"] * min(staleness, MAX_STALENESS)
+            + PRIORITY_WEIGHTS["email"] * email
+            + PRIORITY_WEIGHTS["popularity"] * math.log10(1 + popularity.get(key, 0)) / 3
+            + PRIORITY_WEIGHTS["backlog"] * (key in backlog_keys))
+
+def prioritize_feeds(feeds, feed_schedule, backlog=(), now=None):
+    """Order feeds by descending priority score (staleness, has-email, iTunes popularity, backlog)."""
+    now = now or time.time()
+    popularity = load_popularity()
+    backlog_keys = {canonicalize_feed_url(url) for url in backlog}
+    scores = {url: priority_score(url, feed_schedule, popularity, backlog_keys, now) for url in feeds}
+    return sorted(feeds, key=lambda url: scores[url], reverse=True)
@@ -0,0 +1,67 @@
+# email_validation.py
+import re
+
+import instrumentation
+
+# Syntax check applied to the lower-cased address in a single vectorized pass
+EMAIL_PATTERN = re.compile(
+    r"[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r"@(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+(?:[a-z]{2,63}|xn--[a-z0-9-]{1,59})"
+)
+# The address inside values such as "mailto:a@b.org?subject=Hi", "a@b.org (Name)" or "Name <a@b.org>"
+ADDRESS_PATTERN = r"([^\s<>()\[\]\"',;:]+@[^\s<>()\[\]\"',;:?]+)"
+
+# Placeholders the sources use instead of an address
+INVALID_EMAIL_VALUES = ["n/a", "nan", "none", "", "null", "<na>"]
+
+# Domains that never receive real mail; checked without any DNS/MX lookup
+PLACEHOLDER_DOMAINS = {
+    "example.com", "example.org", "example.net", "test.com", "domain.com",
+    "yourdomain.com", "localhost", "invalid", "noemail.com",
+}
+CHECK_EMAIL_DOMAINS = True
+
+def normalize_emails(values):
+    """
+    Lower-case a column of email values and pull the address out of mailto: links and
+    "address (Name)" forms; values without an address are only stripped, and missing values
+    become empty strings.
+    """
+    import pandas as pd
+    emails = pd.Series(values, dtype="object").fillna("").astype(str).str.strip().str.lower()
+    return emails.str.extract(ADDRESS_PATTERN, expand=False).str.rstrip(".").fillna(emails)
+
+def valid_email_mask(emails, check_domains=CHECK_EMAIL_DOMAINS):
+    """Return a boolean mask of the normalized emails that pass the syntax (and optional domain) checks."""
+    mask = ~emails.isin(INVALID_EMAIL_VALUES) & emails.str.fullmatch(EMAIL_PATTERN).fillna(False).astype(bool)
+    if check_domains:
+        domains = emails.str.rpartition("@")[2]
+        mask &= ~domains.isin(PLACEHOLDER_DOMAINS)
+        # Reserved and documentation TLDs never have mail exchangers
+        mask &= ~domains.str.endswith((".test", ".example", ".invalid", ".localhost", ".local"))
+    return mask
+
+def validate_emails(df, column="author_email", label=None, check_domains=CHECK_EMAIL_DOMAINS):
+    """
+    Normalize and validate the email column of a record batch.
+
+    Returns the batch with lower-cased emails and without the rows whose email is invalid,
+    and a {source: rejected count} dict, which is also printed.
+    """
+    if df.empty or column not in df.columns:
+        return df, {}
+    with instrumentation.timer("validate.emails"):
+        emails = normalize_emails(df[column]).set_axis(df.index)
+        mask = valid_email_mask(emails, check_domains)
+    df = df.copy()
+    df[column] = emails
+    if "source" in df.columns:
+        rejected = (~mask).groupby(df["source"].astype(object).fillna("unknown").astype(str)).sum()
+        rejected = {source: int(count) for source, count in rejected.items() if count}
+    else:
+        rejected = {label or "unknown": int((~mask).sum())} if (~mask).any() else {}
+    for source, rejected_count in rejected.items():
+        instrumentation.count(f"emails.rejected.{source}", rejected_count)
+    summary = ", ".join(f"{source}={count}" for source, count in rejected.items()) or "none"
+    print(f"📧 Email validation{f' ({label})' if label else ''}: {int(mask.sum())} valid, rejected: {summary}")
+    return df[mask], rejected
@@ -1,6 +1,10 @@
 # extract_raw_data.py
 import os
 import json
+import time
+
+import instrumentation
+from feed_urls import build_alias_index, preferred_alias
 
 RAW_DATA_DIR = "raw_data"
 
@@ -12,7 +16,7 @@ def load_all_raw_data():
     for fname in os.listdir(RAW_DATA_DIR):
         if fname.endswith(".json"):
             try:
-                with open(os.path.join(RAW_DATA_DIR, fname), "r", encoding="utf-8") as f:
+                with instrumentation.timer("raw.load_file"), open(os.path.join(RAW_DATA_DIR, fname), "r", encoding="utf-8") as f:
                     data = json.load(f)
                     all_data.append(data)
             except Exception as e:
@@ -20,15 +24,19 @@ def load_all_raw_data():
     return all_data
 
 def extract_rss_urls_from_raw():
-    """Extract unique RSS feed URLs from all raw JSON files."""
+    """Extract unique RSS feed URLs from all raw JSON files, one URL per canonical feed."""
     all_data = load_all_raw_data()
-    rss_urls = set()
+    start = time.perf_counter()
+    rss_urls = []
     for dataset in all_data:
         for result in dataset.get("results", []):
             feed = result.get("feedUrl")
             if feed:
-                rss_urls.add(feed)
-    return list(rss_urls)
+                rss_urls.append(feed)
+    index = build_alias_index(rss_urls)
+    instrumentation.record_time("raw.extract_urls", time.perf_counter() - start)
+    instrumentation.count("raw.urls", len(index))
+    return [preferred_alias(aliases) for aliases in index.values()]
 
 if __name__ == "__main__":
     urls = extract_rss_urls_from_raw()
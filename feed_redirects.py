@@ -0,0 +1,66 @@
+# feed_redirects.py
+from feed_urls import canonicalize_feed_url
+from json_store import load_json, write_json
+
+REDIRECTS_FILE = "feed_redirects.json"
+MAX_REDIRECT_CHAIN = 5  # Longer chains are not learned (fetching follows requests' own limit)
+PERMANENT_REDIRECT_CODES = {301, 308}
+
+def load_redirects(filename=REDIRECTS_FILE):
+    """Load the learned canonical feed URL -> destination URL map."""
+    return load_json(filename, {})
+
+def save_redirects(redirects, filename=REDIRECTS_FILE):
+    """Persist the redirect map."""
+    write_json(filename, redirects, indent=2, sort_keys=True)
+
+def permanent_destination(response):
+    """
+    Return the URL a response was permanently redirected to, or None.
+
+    Only the leading run of 301/308 hops counts; a temporary hop (302/307) ends the
+    permanent part of the chain. Chains that revisit a URL or exceed MAX_REDIRECT_CHAIN
+    hops are ignored. Loops are detected on the exact URLs: a scheme upgrade or an added
+    trailing slash changes the URL but not its canonical key, and is a redirect worth learning.
+    """
+    history = list(response.history)
+    if not history or len(history) > MAX_REDIRECT_CHAIN:
+        return None
+    hops = [r.url for r in history] + [response.url]
+    if len(set(hops)) != len(hops):
+        return None
+    destination = None
+    for i, hop in enumerate(history):
+        if hop.status_code not in PERMANENT_REDIRECT_CODES:
+            break
+        destination = hops[i + 1]
+    return destination
+
+def resolve_redirect(url, redirects):
+    """
+    Follow learned redirects for a URL, stopping at loops or after MAX_REDIRECT_CHAIN hops.
+    A target with the URL's own canonical key (http -> https, /feed -> /feed/) is a respelling
+    of the same feed; it is taken as is and ends the chain.
+    """
+    seen = {url}
+    for _ in range(MAX_REDIRECT_CHAIN):
+        key = canonicalize_feed_url(url)
+        target = redirects.get(key)
+        if target is None or target in seen:
+            break
+        seen.add(target)
+        url = target
+        if canonicalize_feed_url(target) == key:
+            break
+    return url
+
+def learn_redirects(learned, filename=REDIRECTS_FILE):
+    """Merge newly observed {source URL: destination URL} redirects into the stored map."""
+    redirects = load_redirects(filename)
+    for source, destination in learned.items():
+        # Never store a redirect that would point back at its own source
+        if resolve_redirect(destination, redirects) == source:
+            continue
+        redirects[canonicalize_feed_url(source)] = destination
+    save_redirects(redirects, filename)
+    return redirects
@@ -0,0 +1,70 @@
+# feed_registry.py
+import importlib
+import threading
+
+from feed_urls import build_alias_index, canonicalize_feed_url, dedupe_feed_urls
+from feed_redirects import learn_redirects, load_redirects, resolve_redirect
+
+RSS_FEED_FILE = "rss_feed.py"  # Contains RSS_FEEDS list
+
+# Sources run concurrently, so every read-modify-write of rss_feed.py holds this lock
+_registry_lock = threading.RLock()
+_feed_module = None
+
+def _rss_feed():
+    """Import rss_feed (it must define RSS_FEEDS as a list of RSS URLs) on first use."""
+    global _feed_module
+    with _registry_lock:
+        if _feed_module is None:
+            _feed_module = importlib.import_module("rss_feed")
+        return _feed_module
+
+def load_feeds():
+    """Return the current list of registered RSS feed URLs."""
+    return list(_rss_feed().RSS_FEEDS)
+
+def alias_index(feeds=None):
+    """Return the canonical URL -> aliases index for the registry (or the given feeds)."""
+    return build_alias_index(load_feeds() if feeds is None else feeds)
+
+def write_feeds(feeds):
+    """Write the feed list to rss_feed.py, one URL per canonical feed, and reload the module."""
+    with _registry_lock:
+        feeds = sorted(dedupe_feed_urls(feeds))
+        with open(RSS_FEED_FILE, "w", encoding="utf-8") as f:
+            f.write("RSS_FEEDS = [\n")
+            for url in feeds:
+                f.write(f'    "{url}",\n')
+            f.write("]\n")
+        importlib.reload(_rss_feed())
+        return len(feeds)
+
+def add_feeds(urls):
+    """Register new feed URLs, ignoring spelling variants of feeds already in the registry."""
+    with _registry_lock:
+        index = alias_index()
+        redirects = load_redirects()
+        urls = [resolve_redirect(url, redirects) for url in urls]
+        new_feeds = [url for url in dedupe_feed_urls(urls) if canonicalize_feed_url(url) not in index]
+        total = write_feeds(load_feeds() + new_feeds)
+        return new_feeds, total
+
+def remove_feeds(urls):
+    """Remove feeds (and every spelling variant of them) from the registry."""
+    with _registry_lock:
+        removed = {canonicalize_feed_url(url) for url in urls}
+        feeds = load_feeds()
+        kept = [url for url in feeds if canonicalize_feed_url(url) not in removed]
+        write_feeds(kept)
+        return len(feeds) - len(kept)
+
+def apply_redirects(learned):
+    """Record permanent redirects and rewrite the affected registry entries to their final URL."""
+    if not learned:
+        return 0
+    with _registry_lock:
+        redirects = learn_redirects(learned)
+        feeds = load_feeds()
+        updated = [resolve_redirect(url, redirects) for url in feeds]
+        write_feeds(updated)
+        return sum(1 for old, new in zip(feeds, updated) if old != new)
@@ -0,0 +1,132 @@
+# feed_schedule.py
+import calendar
+import random
+import statistics
+import time
+
+from feed_urls import canonicalize_feed_url
+from json_store import load_json, write_json
+
+FEED_SCHEDULE_FILE = "feed_schedule.json"
+
+HOUR = 3600
+DAY = 24 * HOUR
+MIN_REVISIT = 4 * HOUR       # Never revisit a feed sooner than the RSS job's own interval
+MAX_REVISIT = 30 * DAY       # Even dead feeds are checked monthly
+DEFAULT_REVISIT = DAY        # Feeds without dated entries
+DORMANT_AFTER = 365 * DAY    # No new episode for a year: revisit at MAX_REVISIT
+CADENCE_ENTRIES = 10         # Recent entries used to estimate the publishing cadence
+REVISIT_FRACTION = 0.5       # Revisit twice per publishing interval to pick new episodes up promptly
+UNCHANGED_BACKOFF = 1.5      # Interval growth each time a revisit finds nothing new
+REVISIT_JITTER = 0.1         # Spread due times so feeds first seen together do not stay in lockstep
+FAILED_RUNS_LIMIT = 5        # A feed unreachable this many runs in a row...
+FAILING_DAYS_LIMIT = 7       # ...and for at least this many days is invalidated
+
+def entry_timestamps(entries):
+    """Unix timestamps of the entries' published (or updated) dates, newest first."""
+    times = []
+    for entry in entries:
+        parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+        if parsed:
+            times.append(calendar.timegm(parsed))
+    return sorted(times, reverse=True)
+
+def publishing_cadence(times):
+    """Median gap in seconds between the most recent entries, or None with fewer than two dates."""
+    recent = times[:CADENCE_ENTRIES]
+    gaps = [newer - older for newer, older in zip(recent, recent[1:]) if newer > older]
+    return statistics.median(gaps) if gaps else None
+
+def revisit_interval(times, previous=None, now=None):
+    """
+    Seconds until a feed should be fetched again, from its entry dates and the previous visit.
+    Active feeds are revisited at REVISIT_FRACTION of their cadence; a visit that finds no new
+    entry grows the previous interval by UNCHANGED_BACKOFF; dormant feeds wait MAX_REVISIT.
+    """
+    now = now or time.time()
+    latest = times[0] if times else None
+    if latest is not None and now - latest > DORMANT_AFTER:
+        return MAX_REVISIT
+    cadence = publishing_cadence(times)
+    interval = cadence * REVISIT_FRACTION if cadence else DEFAULT_REVISIT
+    if previous and previous.get("latest_entry") == latest and previous.get("entries") == len(times):
+        interval = max(interval, previous.get("interval", 0) * UNCHANGED_BACKOFF)
+    return min(MAX_REVISIT, max(MIN_REVISIT, interval))
+
+class FeedSchedule:
+    """
+    Per-feed revisit plan, keyed by canonical feed URL and stored in feed_schedule.json.
+    Each entry keeps the feed's latest entry date, its entry count, the current revisit
+    interval, when it is next due, the last valid record, which stands in for the feed
+    while it is not due, and the sha256 of the body that record was parsed from. Feeds that
+    keep failing transiently also carry how many runs in a row failed and since when.
+    """
+    def __init__(self, path=FEED_SCHEDULE_FILE):
+        self.path = path
+        self.feeds = load_json(path, {})
+
+    def entry(self, url):
+        return self.feeds.get(canonicalize_feed_url(url))
+
+    def is_due(self, url, now=None):
+        """Feeds never fetched, or without a stored record, are always due."""
+        entry = self.entry(url)
+        if not entry or not entry.get("record"):
+            return True
+        return entry.get("next_due", 0) <= (now or time.time())
+
+    def cached_record(self, url):
+        entry = self.entry(url)
+        return entry.get("record") if entry else None
+
+    def is_unchanged(self, url, content_hash):
+        """Whether a downloaded body is the one the stored record was parsed from."""
+        entry = self.entry(url)
+        return bool(entry and entry.get("record") and content_hash and entry.get("content_hash") == content_hash)
+
+    def update(self, url, times, record, now=None, content_hash=None):
+        """Record a successful fetch of a feed and schedule its next one."""
+        now = now or time.time()
+        key = canonicalize_feed_url(url)
+        previous = self.feeds.get(key)
+        interval = revisit_interval(times, previous, now)
+        self.feeds[key] = {
+            "last_fetched": now,
+            "latest_entry": times[0] if times else None,
+            "entries": len(times),
+            "interval": interval,
+            "next_due": now + interval * random.uniform(1 - REVISIT_JITTER, 1 + REVISIT_JITTER),
+            "record": record,
+            "content_hash": content_hash,
+        }
+        return interval
+
+    def revisit_unchanged(self, url, now=None):
+        """Reschedule a feed whose body had not changed: its interval grows by UNCHANGED_BACKOFF."""
+        now = now or time.time()
+        entry = self.entry(url)
+        entry["last_fetched"] = now
+        entry["interval"] = min(MAX_REVISIT, max(MIN_REVISIT, entry.get("interval", DEFAULT_REVISIT) * UNCHANGED_BACKOFF))
+        entry["next_due"] = now + entry["interval"] * random.uniform(1 - REVISIT_JITTER, 1 + REVISIT_JITTER)
+        entry.pop("failed_runs", None)
+        entry.pop("failing_since", None)
+        return entry["interval"]
+
+    def record_failure(self, url, now=None):
+        """
+        Count a run in which the feed was requested and failed with transient errors.
+        Returns True once it has failed FAILED_RUNS_LIMIT runs in a row over at least
+        FAILING_DAYS_LIMIT days, i.e. the feed looks gone rather than temporarily down.
+        """
+        now = now or time.time()
+        entry = self.feeds.setdefault(canonicalize_feed_url(url), {})
+        entry["failed_runs"] = entry.get("failed_runs", 0) + 1
+        entry.setdefault("failing_since", now)
+        return entry["failed_runs"] >= FAILED_RUNS_LIMIT and now - entry["failing_since"] >= FAILING_DAYS_LIMIT * DAY
+
+    def forget(self, url):
+        """Drop a feed, e.g. once it is found invalid and removed from the registry."""
+        self.feeds.pop(canonicalize_feed_url(url), None)
+
+    def save(self):
+        write_json(self.path, self.feeds, default=str)
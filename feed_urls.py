@@ -0,0 +1,73 @@
+# feed_urls.py
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Hosts that serve the same FeedBurner feed under different names
+FEEDBURNER_HOSTS = {
+    "feeds.feedburner.com": "feeds.feedburner.com",
+    "feeds2.feedburner.com": "feeds.feedburner.com",
+    "feedproxy.google.com": "feeds.feedburner.com",
+}
+
+# Query parameters that only track the click and never change the feed content
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "_ga", "igshid"}
+TRACKING_PARAM_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+def canonicalize_feed_url(url):
+    """
+    Return the canonical spelling of a feed URL, used as a deduplication key.
+
+    The scheme is dropped from the key (http and https variants are the same feed),
+    the host is lower-cased, default ports, fragments, trailing slashes and tracking
+    query parameters are removed, and FeedBurner proxy hosts are folded together.
+    Returns None for empty values.
+    """
+    if url is None:
+        return None
+    url = str(url).strip()
+    if not url or url in ("N/A", "nan", "None"):
+        return None
+    if "://" not in url:
+        url = "http://" + url
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower().rstrip(".")
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or ""
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking_param(k)]
+    if host in FEEDBURNER_HOSTS:
+        host = FEEDBURNER_HOSTS[host]
+        # FeedBurner's ?format=xml only toggles the browser-friendly stylesheet
+        query = [(k, v) for k, v in query if k.lower() != "format"]
+    path = path.rstrip("/")
+    return urlunsplit(("", host, path, urlencode(sorted(query)), "")).lstrip("/")
+
+def preferred_alias(aliases):
+    """Pick the spelling to fetch for a feed: the first https variant, otherwise the first seen."""
+    for alias in aliases:
+        if alias.lower().startswith("https://"):
+            return alias
+    return aliases[0]
+
+def build_alias_index(urls):
+    """Return a canonical URL -> list of aliases index, preserving first-seen order."""
+    index = {}
+    for url in urls:
+        key = canonicalize_feed_url(url)
+        if key is None:
+            continue
+        aliases = index.setdefault(key, [])
+        url = str(url).strip()
+        if url not in aliases:
+            aliases.append(url)
+    return index
+
+def dedupe_feed_urls(urls):
+    """Collapse spelling variants of the same feed, keeping one preferred URL per feed."""
+    return [preferred_alias(aliases) for aliases in build_alias_index(urls).values()]
@@ -1,19 +1,36 @@
-import requests
+# Heavy dependencies (requests, pandas, feedparser, tqdm) and the rss_feed list
+# are imported where they are first used, so importing this module stays cheap.
 import os
-import pandas as pd
-import feedparser
-import xml.etree.ElementTree as ET
-from tqdm import tqdm
+import hashlib
+import multiprocessing
+from contextlib import nullcontext
 from dotenv import load_dotenv
 from datetime import datetime
-from importlib import reload
-import schedule
 import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Import modules
-import rss_feed  # Must define RSS_FEEDS as a list of RSS URLs
 from build_dataset import BuildDataset
 import extract_raw_data
+import feed_registry
+from feed_urls import canonicalize_feed_url, dedupe_feed_urls
+from feed_redirects import load_redirects, permanent_destination, resolve_redirect
+from merge_records import SOURCE_ITUNES, SOURCE_PODCHASER, SOURCE_RSS
+from email_validation import validate_emails
+from records import PodcastRecords, records_to_frame
+from podcast_store import STORE_FILENAME, PodcastStore
+from pipeline import run_pipeline
+from checkpoint import Checkpoint
+from feed_schedule import FAILED_RUNS_LIMIT, FAILING_DAYS_LIMIT, FeedSchedule
+from rss_parsing import parse_feed_bytes
+from crawl_budget import load_backlog, prioritize_feeds, save_backlog
+from host_health import (RSS_MAX_RETRIES, TRANSIENT_STATUS_CODES, CircuitBreaker, CircuitOpenError,
+                         TransientHTTPError, backoff_delay, host_of, is_rate_limited, is_transient, parse_retry_after)
+from host_latency import HostLatency, last_connect_seconds, start_connect_timer, timed_http_adapter
+import instrumentation
+from metrics_export import write_metrics
+import profiling
 
 # Load environment variables
 load_dotenv()
@@ -28,15 +45,23 @@ HEADERS_PODCHASER = {
 # File paths
 INVALID_RSS_ARCHIVE = "invalid_rss_archive.txt"
 INVALID_RSS_LOG = "invalid_rss_log.txt"
-RSS_FEED_FILE = "rss_feed.py"  # Contains RSS_FEEDS list
+RSS_FEED_FILE = feed_registry.RSS_FEED_FILE  # Contains RSS_FEEDS list
 EXCEL_FILENAME = "podcasts_data.xlsx"
 
-# Ensure log and archive files exist
-for file in [INVALID_RSS_ARCHIVE, INVALID_RSS_LOG]:
-    if not os.path.exists(file):
-        open(file, "w").close()
+RSS_BATCH_SIZE = 100  # Feeds validated and applied to the registry together
+RSS_FETCH_WORKERS = int(os.getenv("RSS_FETCH_WORKERS", "8"))  # Concurrent RSS downloads
+RSS_PARSE_WORKERS = int(os.getenv("RSS_PARSE_WORKERS", str(os.cpu_count() or 1)))  # Feed parsing processes
+RSS_PARSE_CHUNK_SIZE = 10  # Feed bodies sent to a parse process at a time
+UNCHANGED_REPORT_HOSTS = 10  # Hosts listed in the unchanged-feed report, most feeds first
+COMPRESSION_REPORT_HOSTS = 10  # Hosts listed with their compression ratio at the end of an RSS run
+RSS_TIMEOUT = 10  # Seconds per RSS request (connect and between bytes) for hosts without latency history
+RSS_MAX_BODY_BYTES = int(float(os.getenv("RSS_MAX_BODY_MB", "20")) * 1e6)  # Larger feeds are skipped
+RSS_CHUNK_SIZE = 64 * 1024  # Bytes per streamed read of a feed body
+PODCHASER_CHECKPOINT_PAGES = 5  # Podchaser pages between checkpoint writes
+ITUNES_FETCH_WORKERS = 1  # Concurrent iTunes searches; the Search API allows roughly 20 calls per minute
 
-print(f"Loaded {len(rss_feed.RSS_FEEDS)} RSS feeds from rss_feed.py")
+class FeedTooLargeError(Exception):
+    """The feed's body is over RSS_MAX_BODY_BYTES once decompressed."""
 
 def log_invalid_rss(rss_url, reason):
     """Log invalid RSS feeds with timestamps and archive them."""
@@ -48,208 +73,588 @@ def log_invalid_rss(rss_url, reason):
     with open(INVALID_RSS_ARCHIVE, "a", encoding="utf-8") as archive_file:
         archive_file.write(f"{rss_url}\n")
 
-def fetch_podchaser_data():
-    """Fetch podcast data from Podchaser API using numeric pagination with 100 items per call."""
-    podcasts = []
-    page = 0
-    while True:
-        query = f"""
-        {{
-            podcasts(first: 100, page: {page}) {{
-                data {{
-                    id
-                    title
-                    rssUrl
-                    imageUrl
-                    language
-                    numberOfEpisodes
-                    startDate
-                    latestEpisodeDate
-                    author {{
-                        name
-                        email
+def iter_podchaser_records(api_url=None):
+    """
+    Yield podcast records from the Podchaser API page by page (100 items per call), validated per page.
+    Completed pages are checkpointed, so an interrupted run resumes after the last saved page.
+    """
+    import requests
+    api_url = api_url or PODCHASER_API_URL
+    with Checkpoint("podchaser", interval=PODCHASER_CHECKPOINT_PAGES) as checkpoint:
+        yield from checkpoint.results
+        page = max(checkpoint.completed, default=-1) + 1
+        while True:
+            query = f"""
+            {{
+                podcasts(first: 100, page: {page}) {{
+                    data {{
+                        id
+                        title
+                        rssUrl
+                        imageUrl
+                        language
+                        numberOfEpisodes
+                        startDate
+                        latestEpisodeDate
+                        author {{
+                            name
+                            email
+                        }}
                     }}
                 }}
             }}
-        }}
-        """
-        response = requests.post(PODCHASER_API_URL, json={"query": query}, headers=HEADERS_PODCHASER)
-        print("Podchaser Status Code:", response.status_code)
-        print("Podchaser Response Content:", response.text[:500])
-        if response.status_code != 200:
-            print(f"❌ Error fetching Podchaser data: {response.status_code} - {response.text}")
-            break
-        try:
-            data = response.json()
-            page_data = data.get("data", {}).get("podcasts", {}).get("data", [])
-            if not page_data:
+            """
+            with instrumentation.timer("podchaser.request"):
+                response = requests.post(api_url, json={"query": query}, headers=HEADERS_PODCHASER)
+            instrumentation.count(f"http.status.{response.status_code}")
+            instrumentation.count("podchaser.bytes", len(response.content))
+            print("Podchaser Status Code:", response.status_code)
+            print("Podchaser Response Content:", response.text[:500])
+            if response.status_code != 200:
+                print(f"❌ Error fetching Podchaser data: {response.status_code} - {response.text}")
+                checkpoint.keep()
                 break
-            for podcast in page_data:
-                if not podcast.get("author", {}).get("email"):
-                    continue
-                podcasts.append({
-                    "id": podcast.get("id", "N/A"),
-                    "title": podcast.get("title", "N/A"),
-                    "description": "",
-                    "url": "",
-                    "webUrl": "",
-                    "rssUrl": podcast.get("rssUrl", "N/A"),
-                    "imageUrl": podcast.get("imageUrl", "N/A"),
-                    "language": podcast.get("language", "N/A"),
-                    "numberOfEpisodes": podcast.get("numberOfEpisodes", 0),
-                    "startDate": podcast.get("startDate", "N/A"),
-                    "latestEpisodeDate": podcast.get("latestEpisodeDate", "N/A"),
-                    "categories": None,
-                    "author_name": podcast.get("author", {}).get("name", "N/A"),
-                    "author_email": podcast.get("author", {}).get("email", "N/A"),
-                    "source": "Podchaser"
-                })
+            try:
+                data = response.json()
+                page_data = data.get("data", {}).get("podcasts", {}).get("data", [])
+                if not page_data:
+                    break
+                page_podcasts = PodcastRecords()
+                for podcast in page_data:
+                    page_podcasts.append({
+                        "id": podcast.get("id", "N/A"),
+                        "title": podcast.get("title", "N/A"),
+                        "description": "",
+                        "url": "",
+                        "webUrl": "",
+                        "rssUrl": podcast.get("rssUrl", "N/A"),
+                        "imageUrl": podcast.get("imageUrl", "N/A"),
+                        "language": podcast.get("language", "N/A"),
+                        "numberOfEpisodes": podcast.get("numberOfEpisodes", 0),
+                        "startDate": podcast.get("startDate", "N/A"),
+                        "latestEpisodeDate": podcast.get("latestEpisodeDate", "N/A"),
+                        "categories": None,
+                        "author_name": podcast.get("author", {}).get("name", "N/A"),
+                        "author_email": podcast.get("author", {}).get("email", "N/A"),
+                        "source": "Podchaser"
+                    })
+                valid_df, _ = validate_emails(page_podcasts.to_frame(), label=f"Podchaser page {page}")
+            except Exception as e:
+                print("❌ Error parsing Podchaser JSON response:", str(e))
+                checkpoint.keep()
+                break
+            page_records = list(PodcastRecords.from_frame(valid_df))
+            checkpoint.mark_done(page, page_records)
+            yield from page_records
             if len(page_data) < 100:
                 break
             page += 1
-        except Exception as e:
-            print("❌ Error parsing Podchaser JSON response:", str(e))
-            break
-    return podcasts
 
-def fetch_rss_feed_data(feed_urls):
-    """Extract podcast metadata from RSS feeds, including itunes:email.
-       Fetches the feed content using requests and passes the raw XML to feedparser.
+def fetch_podchaser_data(api_url=None):
+    """Fetch podcast data from Podchaser API using numeric pagination with 100 items per call."""
+    return PodcastRecords(iter_podchaser_records(api_url))
+
+def _finish_rss_batch(batch, batch_feeds, batch_visits, invalid_feeds, learned_redirects, checkpoint, feed_schedule):
+    """
+    Validate a batch of RSS records in one pass, apply its registry changes
+    (invalid feed removal, learned redirects), schedule the next visit of each valid
+    feed and checkpoint the batch. Returns the valid records. A record whose email fails
+    validation is only dropped; the feed stays in the registry, as it does have an owner email.
+    """
+    valid = []
+    if batch:
+        frame = batch.to_frame()
+        valid_df, _ = validate_emails(frame, label="RSS Feed")
+        for i in frame.index.difference(valid_df.index):
+            print(f"📌 Feed {batch_feeds[i]}: email {frame.at[i, 'author_email']!r} rejected, record dropped.")
+            checkpoint.mark_done(batch_feeds[i])
+        for i, record in zip(valid_df.index, PodcastRecords.from_frame(valid_df)):
+            checkpoint.mark_done(batch_feeds[i], [record])
+            entry_times, content_hash = batch_visits[i]
+            feed_schedule.update(record["rssUrl"], entry_times, record, content_hash=content_hash)
+            valid.append(record)
+    instrumentation.count("rss.invalid", len(invalid_feeds))
+    for feed, reason in invalid_feeds.items():
+        log_invalid_rss(feed, reason)
+        learned_redirects.pop(feed, None)
+        checkpoint.mark_done(feed)
+        feed_schedule.forget(feed)
+    feed_schedule.save()
+    remove_invalid_feeds(list(invalid_feeds))
+    if learned_redirects:
+        rewritten = feed_registry.apply_redirects(learned_redirects)
+        print(f"✅ Learned {len(learned_redirects)} permanent redirects, {rewritten} registry entries rewritten.")
+    checkpoint.flush()
+    return valid
+
+_thread_state = threading.local()
+
+def _rss_session():
+    """Return this thread's requests session; sessions are not shared between fetch workers."""
+    session = getattr(_thread_state, "session", None)
+    if session is None:
+        import requests
+        # requests already asks for every encoding urllib3 can decode: gzip, deflate and br (brotli is in requirements.txt)
+        session = requests.Session()
+        session.mount("http://", timed_http_adapter())
+        session.mount("https://", timed_http_adapter())
+        _thread_state.session = session
+    return session
+
+def _read_body(response, limit=RSS_MAX_BODY_BYTES):
+    """
+    Stream a response body, decompressing it, and stop as soon as it grows over `limit` bytes,
+    so a giant feed is never held in memory whole. Returns (body, bytes received on the wire).
+    """
+    length = response.headers.get("Content-Length", "")
+    # Content-Length counts compressed bytes, and decompressing only makes a body larger
+    if length.isdigit() and int(length) > limit:
+        response.close()
+        raise FeedTooLargeError(f"{int(length) / 1e6:.1f} MB announced, limit {limit / 1e6:.1f} MB")
+    chunks, size = [], 0
+    for chunk in response.iter_content(RSS_CHUNK_SIZE):
+        size += len(chunk)
+        if size > limit:
+            response.close()
+            raise FeedTooLargeError(f"over the {limit / 1e6:.1f} MB limit")
+        chunks.append(chunk)
+    return b"".join(chunks), response.raw.tell()
+
+def _download_feed(feed, breaker, latency):
     """
-    podcasts = []
-    invalid_feeds = []
-    for feed in tqdm(feed_urls, desc="Fetching RSS Feeds"):
+    GET a feed and read its body, retrying transient errors (timeouts, resets, 429/5xx) with
+    jittered exponential backoff. Every attempt except a 429 is reported to the host's circuit
+    breaker, and its latency to the host's history, which sets the next attempt's timeout.
+    Returns (response, body, wire bytes); raises the last error, or CircuitOpenError once the host's
+    circuit is open.
+    """
+    host = host_of(feed)
+    for attempt in range(RSS_MAX_RETRIES + 1):
+        if not breaker.allow(host):
+            raise CircuitOpenError(f"circuit open for {host}")
         try:
-            response = requests.get(feed, timeout=10)
+            timeout = latency.timeout(host, RSS_TIMEOUT)
+            start_connect_timer()
+            try:
+                # stream=True returns after the headers, so connect/TLS/server time and the body download are timed apart
+                with instrumentation.timer("rss.request"):
+                    response = _rss_session().get(feed, timeout=timeout, stream=True)
+            except Exception as e:
+                latency.record_failure(host, e)
+                raise
+            latency.record_success(host, last_connect_seconds(), response.elapsed.total_seconds())
+            instrumentation.count(f"http.status.{response.status_code}")
+            if response.status_code in TRANSIENT_STATUS_CODES:
+                response.close()
+                raise TransientHTTPError(response.status_code, parse_retry_after(response.headers.get("Retry-After")))
             response.raise_for_status()
-            raw_xml = response.text
-            parsed_feed = feedparser.parse(raw_xml)
-            root = ET.fromstring(raw_xml)
-            namespace = {"itunes": "http://www.itunes.com/dtds/podcast-1.0.dtd"}
-            email_elem = root.find(".//itunes:owner/itunes:email", namespace)
-            author_email = email_elem.text.strip() if email_elem is not None else None
+            with instrumentation.timer("rss.download"):
+                body, wire_bytes = _read_body(response)
+            breaker.record_success(host)
+            latency.record_transfer(host, wire_bytes, len(body))
+            return response, body, wire_bytes
         except Exception as e:
+            if not is_transient(e):
+                raise
+            # A 429 means the host is up but throttling; its Retry-After is honoured below instead
+            if not is_rate_limited(e) and breaker.record_failure(host):
+                instrumentation.count("rss.circuits_opened")
+                print(f"❌ Circuit open for {host}: its remaining feeds are skipped this run.")
+            if attempt == RSS_MAX_RETRIES:
+                raise
+            instrumentation.count("rss.retries")
+            time.sleep(backoff_delay(attempt, getattr(e, "retry_after", None)))
+
+def download_rss_feed(feed, budget=None, breaker=None, latency=None):
+    """
+    Download one RSS feed: the I/O half of the RSS stage, run on the fetch threads. Returns
+    (body, content type, body sha256, permanent redirect destination, retry reason); body is None
+    when the feed could not be fetched. The retry reason is "transient", "rate_limited" (429),
+    "short_circuited" (open host circuit, not requested) or "too_large" when the feed is kept for
+    the next run rather than treated as invalid, and None otherwise. Returns None without fetching once the crawl budget is exhausted.
+    Timeouts come from the host's latency history (see host_latency.py).
+    """
+    if budget is not None and budget.exhausted():
+        return None
+    breaker = breaker or CircuitBreaker()
+    latency = latency or HostLatency(path=None)
+    feed_start = time.perf_counter()
+    body, content_type, content_hash, destination, retry_reason = None, "", None, None, None
+    try:
+        response, body, wire_bytes = _download_feed(feed, breaker, latency)
+        destination = permanent_destination(response)
+        content_type = response.headers.get("Content-Type", "")
+        content_hash = hashlib.sha256(body).hexdigest()
+        instrumentation.count("rss.bytes", len(body))
+        instrumentation.count("rss.wire_bytes", wire_bytes)
+        if budget is not None:
+            budget.spend(wire_bytes)
+    except FeedTooLargeError as e:
+        print(f"❌ Feed {feed} skipped, kept for the next run: {e}")
+        instrumentation.count("rss.too_large")
+        retry_reason = "too_large"
+    except CircuitOpenError:
+        instrumentation.count("rss.short_circuited")
+        retry_reason = "short_circuited"
+    except Exception as e:
+        if is_rate_limited(e):
+            retry_reason = "rate_limited"
+            print(f"⏰ Feed {feed} rate limited by its host, kept for the next run: {e}")
+            instrumentation.count("rss.rate_limited")
+        elif is_transient(e):
+            retry_reason = "transient"
+            print(f"⏰ Feed {feed} failed transiently, kept for the next run: {e}")
+            instrumentation.count("rss.transient")
+        else:
             print(f"❌ Failed to process feed {feed}: {e}")
-            author_email = None
-            parsed_feed = None
+            instrumentation.count("rss.failed")
+    instrumentation.record_time("rss.feed", time.perf_counter() - feed_start)
+    return body, content_type, content_hash, destination, retry_reason
+
+def _parse_bodies(parse_pool, downloads):
+    """
+    Hand the downloaded bodies of a batch to the parse pool in chunks of RSS_PARSE_CHUNK_SIZE.
+    Returns a lazy iterator of parse_feed_bytes results in download order; parsing runs in the
+    background meanwhile. Without a pool, feeds are parsed in this process as the iterator is read.
+    """
+    bodies = [result[0] for _, result, _ in downloads]
+    content_types = [result[1] for _, result, _ in downloads]
+    if parse_pool is None:
+        return map(parse_feed_bytes, bodies, content_types)
+    return parse_pool.map(parse_feed_bytes, bodies, content_types, chunksize=RSS_PARSE_CHUNK_SIZE)
+
+def _rss_record(rss_url, parsed):
+    return {
+        "id": "N/A",
+        "title": parsed["title"],
+        "description": parsed["description"],
+        "url": parsed["link"],
+        "webUrl": parsed["link"],
+        "rssUrl": rss_url,
+        "imageUrl": parsed["image"],
+        "language": parsed["language"],
+        "numberOfEpisodes": parsed["episodes"],
+        "latestEpisodeDate": parsed["latest_published"],
+        "author_name": parsed["author"],
+        "author_email": parsed["author_email"],
+        "source": "RSS Feed"
+    }
+
+def _process_rss_batch(downloaded, parsed_results, checkpoint, feed_schedule, unreached):
+    """
+    Turn a downloaded batch and its parse results into records, then validate, apply and
+    checkpoint it (see _finish_rss_batch). Feeds whose body is unchanged since their stored
+    record was made were not parsed; that record is yielded again and the feed rescheduled.
+    Feeds the crawl budget did not reach also yield their stored record, if any.
+    A feed that could not be fetched for FAILED_RUNS_LIMIT runs over FAILING_DAYS_LIMIT days
+    (see feed_schedule.py) is invalidated like a permanently failing one.
+    """
+    batch = PodcastRecords()
+    batch_feeds = []  # Feed URL of each entry in batch
+    batch_visits = []  # (entry dates, body sha256) of each entry in batch, for revisit scheduling
+    invalid_feeds = {}  # Feed URL -> reason
+    learned_redirects = {}
+    for feed, result, unchanged in downloaded:
+        if result is None:
+            unreached.append(feed)
+            cached = feed_schedule.cached_record(feed)
+            if cached:
+                yield cached
+            continue
+        body, _, content_hash, destination, retry_reason = result
+        # Only a feed that was requested and failed counts towards giving up on it; a throttling
+        # host or an open circuit says nothing about the feed itself
+        if retry_reason == "transient" and feed_schedule.record_failure(feed):
+            invalid_feeds[feed] = f"Unreachable for {FAILED_RUNS_LIMIT} runs over {FAILING_DAYS_LIMIT} days"
+            continue
+        if retry_reason:
+            cached = feed_schedule.cached_record(feed)
+            if cached:
+                yield cached
+            continue
+        if destination:
+            learned_redirects[feed] = destination
+        if unchanged:
+            record = feed_schedule.cached_record(feed)
+            feed_schedule.revisit_unchanged(feed)
+            checkpoint.mark_done(feed, [record])
+            yield record
+            continue
+        parsed = next(parsed_results) if body is not None else None
+        if parsed is not None:
+            for stage, seconds in parsed["timings"].items():
+                instrumentation.record_time(stage, seconds)
+            if "error" in parsed:
+                print(f"❌ Failed to process feed {feed}: {parsed['error']}")
+                instrumentation.count("rss.failed")
+                parsed = None
+        author_email = parsed["author_email"] if parsed else None
         print(f"📡 Feed: {feed} - Extracted Email: {author_email}")
-        if not author_email or author_email.lower() in ["n/a", "nan", "none", "", "null"]:
-            log_invalid_rss(feed, "Missing or invalid email")
-            invalid_feeds.append(feed)
+        if parsed is None:
+            invalid_feeds[feed] = "Unparseable feed"
             continue
-        if parsed_feed is None:
+        if not author_email:
+            invalid_feeds[feed] = "Missing itunes:owner email"
             continue
-        podcasts.append({
-            "id": "N/A",
-            "title": parsed_feed.feed.get("title", "N/A"),
-            "description": parsed_feed.feed.get("description", "N/A"),
-            "url": parsed_feed.feed.get("link", "N/A"),
-            "webUrl": parsed_feed.feed.get("link", "N/A"),
-            "rssUrl": feed,
-            "imageUrl": parsed_feed.feed.get("image", {}).get("href", "N/A"),
-            "language": parsed_feed.feed.get("language", "N/A"),
-            "numberOfEpisodes": len(parsed_feed.entries),
-            "latestEpisodeDate": parsed_feed.entries[0].get("published", "N/A") if parsed_feed.entries else "N/A",
-            "author_name": parsed_feed.feed.get("author", "N/A"),
-            "author_email": author_email,
-            "source": "RSS Feed"
-        })
-    remove_invalid_feeds(invalid_feeds)
-    return podcasts
+        batch_feeds.append(feed)
+        batch_visits.append((parsed["entry_times"], content_hash))
+        batch.append(_rss_record(learned_redirects.get(feed, feed), parsed))
+    yield from _finish_rss_batch(batch, batch_feeds, batch_visits, invalid_feeds,
+                                 learned_redirects, checkpoint, feed_schedule)
+
+def _report_unchanged(host_visits):
+    """Print how many downloaded feeds were unchanged and not re-parsed, overall and for the busiest hosts."""
+    downloaded = sum(visits[1] for visits in host_visits.values())
+    if not downloaded:
+        return
+    unchanged = sum(visits[0] for visits in host_visits.values())
+    print(f"♻️ {unchanged} of {downloaded} downloaded feeds unchanged since the last run ({100 * unchanged / downloaded:.0f}%), not re-parsed.")
+    busiest = sorted(host_visits.items(), key=lambda item: item[1][1], reverse=True)[:UNCHANGED_REPORT_HOSTS]
+    for host, (host_unchanged, host_downloaded) in busiest:
+        print(f"   {host}: {host_unchanged}/{host_downloaded} unchanged ({100 * host_unchanged / host_downloaded:.0f}%)")
+
+def _report_compression(host_visits, latency):
+    """Print the compression ratio (decompressed / wire bytes, all runs) of the hosts most downloaded from this run."""
+    busiest = sorted(host_visits.items(), key=lambda item: item[1][1], reverse=True)[:COMPRESSION_REPORT_HOSTS]
+    ratios = [(host, latency.compression_ratio(host)) for host, _ in busiest]
+    ratios = [(host, ratio) for host, ratio in ratios if ratio is not None]
+    if ratios:
+        print("📊 Compression by host: " + ", ".join(f"{host} {ratio:.1f}x" for host, ratio in ratios))
+
+def iter_rss_feed_records(feed_urls, workers=RSS_FETCH_WORKERS, only_due=True, budget=None, parse_workers=RSS_PARSE_WORKERS):
+    """Yield podcast metadata from RSS feeds, including itunes:email, in batches of RSS_BATCH_SIZE feeds.
+       Each batch is downloaded by `workers` threads, then parsed from the raw XML bytes by
+       `parse_workers` processes (in this process if parse_workers <= 1) while the next batch downloads.
+       Each finished batch is checkpointed; a resumed run skips the feeds already done.
+       With only_due, feeds not yet due for a revisit (see feed_schedule.py) are not fetched;
+       their last valid record is yielded instead.
+       With a CrawlBudget, feeds are fetched in priority order (see crawl_budget.py) until the
+       time or byte limit is reached; the feeds not reached are saved and go first next run, and
+       their last valid record, if any, is yielded meanwhile.
+       Transient errors are retried with backoff and a host that keeps failing is skipped for the
+       rest of the run (see host_health.py); such feeds are neither invalidated nor checkpointed,
+       and their last valid record, if any, is yielded instead.
+       A feed whose body hashes the same as when its stored record was made is not parsed again;
+       the skip rate is reported per host.
+    """
+    from tqdm import tqdm
+    # Go straight to known redirect destinations; spelling variants of the same feed are fetched only once
+    redirects = load_redirects()
+    feed_urls = dedupe_feed_urls([resolve_redirect(url, redirects) for url in feed_urls])
+    with Checkpoint("rss", interval=RSS_BATCH_SIZE) as checkpoint, \
+            ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="rss-fetch") as executor:
+        # Feeds finished by an interrupted run are not fetched again
+        yield from checkpoint.results
+        pending_feeds = [url for url in feed_urls if not checkpoint.is_done(url)]
+        feed_schedule = FeedSchedule()
+        if only_due:
+            now = time.time()
+            not_due = [url for url in pending_feeds if not feed_schedule.is_due(url, now)]
+            pending_feeds = [url for url in pending_feeds if feed_schedule.is_due(url, now)]
+            instrumentation.count("rss.not_due", len(not_due))
+            print(f"📡 {len(pending_feeds)} RSS feeds due, {len(not_due)} not due yet (last records reused).")
+            for url in not_due:
+                yield feed_schedule.cached_record(url)
+        unreached = []
+        breaker = CircuitBreaker()
+        latency = HostLatency()
+        host_visits = {}  # Host -> [unchanged bodies, downloaded bodies]
+        if budget is not None:
+            pending_feeds = prioritize_feeds(pending_feeds, feed_schedule, load_backlog())
+        # Worker processes are spawned rather than forked, as forking a process with running threads is unsafe
+        use_pool = parse_workers > 1 and pending_feeds
+        with tqdm(total=len(pending_feeds), desc="Fetching RSS Feeds") as progress, \
+                (ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"))
+                 if use_pool else nullcontext()) as parse_pool:
+            previous = None  # The batch being parsed while the next one downloads
+            for start in range(0, len(pending_feeds), RSS_BATCH_SIZE):
+                batch_urls = pending_feeds[start:start + RSS_BATCH_SIZE]
+                downloaded = []
+                # map() keeps feed order, so batches and checkpoints do not depend on which worker finishes first
+                for feed, result in zip(batch_urls, executor.map(lambda url: download_rss_feed(url, budget, breaker, latency), batch_urls)):
+                    progress.update()
+                    unchanged = False
+                    if result is not None and result[0] is not None:
+                        unchanged = feed_schedule.is_unchanged(feed, result[2])
+                        visits = host_visits.setdefault(host_of(feed), [0, 0])
+                        visits[0] += unchanged
+                        visits[1] += 1
+                    downloaded.append((feed, result, unchanged))
+                parsed_results = _parse_bodies(parse_pool, [item for item in downloaded
+                                                            if item[1] is not None and item[1][0] is not None and not item[2]])
+                if previous:
+                    yield from _process_rss_batch(*previous, checkpoint, feed_schedule, unreached)
+                    latency.save()
+                previous = (downloaded, parsed_results)
+                if budget is not None and budget.exhausted():
+                    unreached.extend(pending_feeds[start + RSS_BATCH_SIZE:])
+                    for url in pending_feeds[start + RSS_BATCH_SIZE:]:
+                        cached = feed_schedule.cached_record(url)
+                        if cached:
+                            yield cached
+                    break
+            if previous:
+                yield from _process_rss_batch(*previous, checkpoint, feed_schedule, unreached)
+                latency.save()
+        if budget is not None:
+            save_backlog(unreached)
+            instrumentation.count("rss.unreached", len(unreached))
+            if unreached:
+                print(f"⏱️ Crawl budget exhausted ({budget.describe()}): {len(unreached)} feeds saved for the next run.")
+        instrumentation.count("rss.unchanged", sum(visits[0] for visits in host_visits.values()))
+        _report_unchanged(host_visits)
+        if breaker.open_hosts:
+            print(f"❌ {len(breaker.open_hosts)} hosts failed repeatedly and were skipped for the rest of the run.")
+        _, counters = instrumentation.snapshot()
+        if counters.get("rss.wire_bytes"):
+            print(f"📊 RSS transfer: {counters['rss.wire_bytes'] / 1e6:.1f} MB on the wire, "
+                  f"{counters.get('rss.bytes', 0) / 1e6:.1f} MB decompressed "
+                  f"({counters.get('rss.bytes', 0) / counters['rss.wire_bytes']:.1f}x).")
+            _report_compression(host_visits, latency)
+
+def fetch_rss_feed_data(feed_urls, workers=RSS_FETCH_WORKERS, only_due=True, budget=None, parse_workers=RSS_PARSE_WORKERS):
+    """Extract podcast metadata from RSS feeds, including itunes:email; only due feeds are fetched unless only_due is off."""
+    return PodcastRecords(iter_rss_feed_records(feed_urls, workers, only_due, budget, parse_workers))
 
 def remove_invalid_feeds(feeds):
-    """Remove invalid RSS feeds from rss_feed.py and reload the module."""
+    """Remove invalid RSS feeds (and their spelling variants) from rss_feed.py and reload the module."""
     if not feeds:
         return
-    with open(RSS_FEED_FILE, "r", encoding="utf-8") as file:
-        lines = file.readlines()
-    with open(RSS_FEED_FILE, "w", encoding="utf-8") as file:
-        for line in lines:
-            if not any(feed in line for feed in feeds):
-                file.write(line)
-    print(f"✅ Invalid RSS feeds removed from {RSS_FEED_FILE}.")
-    reload(rss_feed)
+    removed = feed_registry.remove_feeds(feeds)
+    print(f"✅ {removed} invalid RSS feeds removed from {RSS_FEED_FILE}.")
 
-def build_legacy_data():
+def update_feeds_from_raw_data():
+    """Add the RSS URLs found in the archived iTunes responses to rss_feed.py."""
+    try:
+        new_rss_urls = extract_raw_data.extract_rss_urls_from_raw()
+        print(f"Extracted {len(new_rss_urls)} new RSS URLs from raw data.")
+        added, total = feed_registry.add_feeds(new_rss_urls)
+        print(f"rss_feed.py updated with {total} RSS feeds ({len(added)} new).")
+    except Exception as e:
+        print(f"❌ Error updating RSS feeds from raw data: {e}")
+
+def _fetch_term(builder, term):
+    """Run one iTunes search; returns (rows, None) or (None, error)."""
+    try:
+        return builder.fetch_term(term), None
+    except Exception as e:
+        return None, e
+
+def iter_legacy_records(terms=None, workers=ITUNES_FETCH_WORKERS):
     """
-    Build legacy podcast data using the BuildDataset class (alphabetical approach)
-    and update the RSS feed list from raw data extraction.
+    Yield legacy podcast records term by term using the BuildDataset class (alphabetical approach),
+    checkpointing each completed term. Registering the feeds found in the archived responses is
+    left to the caller (see update_feeds_from_raw_data).
+    `terms` defaults to every alphabet term; `workers` searches run at a time.
     """
-    legacy_data = []
     try:
         builder = BuildDataset(mode="alphabet")
-        legacy_df = builder.build_data()
-        if "Name" in legacy_df.columns:
-            legacy_df = legacy_df.rename(columns={"Name": "title", "Feed URL": "rssUrl"})
-        if "author_email" in legacy_df.columns:
-            legacy_df["author_email"] = legacy_df["author_email"].astype(str).str.strip()
-            legacy_df = legacy_df[~legacy_df["author_email"].isin(["N/A", "nan", "None", "", "NaN"])].dropna(subset=["author_email"])
-        legacy_data = legacy_df.to_dict(orient="records")
-        print(f"Legacy data built with {len(legacy_data)} records.")
+        with Checkpoint("itunes", interval=1) as checkpoint, \
+                ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="itunes-fetch") as executor:
+            yield from checkpoint.results
+            pending_terms = [term for term in (builder.terms if terms is None else terms) if not checkpoint.is_done(term)]
+            workers = max(1, workers)
+            # Submit one round of `workers` terms at a time, so stopping early never leaves a backlog of searches
+            for start in range(0, len(pending_terms), workers):
+                round_terms = pending_terms[start:start + workers]
+                results = executor.map(lambda term: _fetch_term(builder, term), round_terms)
+                for term, (rows, error) in zip(round_terms, results):
+                    if error is not None:
+                        print(f"Error fetching data for term '{term}': {error}")
+                        checkpoint.keep()  # Retry the failed term on the next run
+                        continue
+                    # iTunes never provides emails; keep every row so its fields can be merged
+                    # into the Podchaser/RSS records for the same feed.
+                    records = [{"title": row.pop("Name"), **row, "source": SOURCE_ITUNES} for row in rows]
+                    checkpoint.mark_done(term, records)
+                    yield from records
     except Exception as e:
         print(f"❌ Error building legacy data: {e}")
-        legacy_data = []
-    try:
-        new_rss_urls = extract_raw_data.extract_rss_urls_from_raw()
-        print(f"Extracted {len(new_rss_urls)} new RSS URLs from raw data.")
-        updated_feeds = set(rss_feed.RSS_FEEDS)
-        for url in new_rss_urls:
-            if url not in updated_feeds:
-                updated_feeds.add(url)
-        with open(RSS_FEED_FILE, "w", encoding="utf-8") as f:
-            f.write("RSS_FEEDS = [\n")
-            for url in sorted(updated_feeds):
-                f.write(f'    "{url}",\n')
-            f.write("]\n")
-        reload(rss_feed)
-        print(f"rss_feed.py updated with {len(updated_feeds)} RSS feeds.")
-    except Exception as e:
-        print(f"❌ Error updating RSS feeds from raw data: {e}")
-    return legacy_data
-
-def build_full_database():
-    """Combine Podchaser, RSS, and legacy data to build the full podcast database."""
-    podchaser_data = fetch_podchaser_data()
-    rss_data = fetch_rss_feed_data(rss_feed.RSS_FEEDS)
-    legacy_data = build_legacy_data()
-    full_data = podchaser_data + rss_data + legacy_data
-    print(f"Full database built with {len(full_data)} records.")
+
+def build_full_database(store=None, rss_workers=RSS_FETCH_WORKERS, itunes_workers=ITUNES_FETCH_WORKERS, rss_budget=None,
+                        rss_parse_workers=RSS_PARSE_WORKERS):
+    """
+    Stream Podchaser, RSS, and legacy data concurrently into the podcast store, batch by batch,
+    and return the stored data merged into one row per podcast feed. A failing source keeps
+    the batches it already delivered and does not stop the others. The RSS feeds found in the
+    archived iTunes responses are then added to rss_feed.py for the next build.
+    """
+    if store is None:
+        # A fresh store per build, so podcasts dropped from the sources do not linger; the
+        # checkpoints cover resuming after a crash
+        if os.path.exists(STORE_FILENAME):
+            os.remove(STORE_FILENAME)
+        store = PodcastStore()
+    rss_feeds = feed_registry.load_feeds()
+    print(f"Loaded {len(rss_feeds)} RSS feeds from {RSS_FEED_FILE}")
+    sources = {
+        SOURCE_PODCHASER: iter_podchaser_records(),
+        SOURCE_RSS: iter_rss_feed_records(rss_feeds, rss_workers, budget=rss_budget, parse_workers=rss_parse_workers),
+        SOURCE_ITUNES: iter_legacy_records(workers=itunes_workers),
+    }
+    stats = run_pipeline(sources, store)
+    update_feeds_from_raw_data()
+    with profiling.profile_stage("merge"):
+        full_data = store.merged_records()
+    timings = ", ".join(f"{name} {s['seconds']:.1f}s" for name, s in stats.items())
+    print(f"Full database built with {len(full_data)} records from {store.count()} stored source records ({timings}).")
     return full_data
 
 def save_to_excel(data, filename=EXCEL_FILENAME):
     """Save podcast data to Excel, ensuring rows without valid emails are removed and 'id' is the first column."""
-    new_df = pd.DataFrame(data)
-    new_df["author_email"] = new_df["author_email"].astype(str).str.strip()
-    new_df = new_df[~new_df["author_email"].isin(["N/A", "nan", "None", "", "NaN"])].dropna(subset=["author_email"])
+    import pandas as pd
+    new_df, _ = validate_emails(records_to_frame(data), label="new records")
     if os.path.exists(filename):
-        existing_df = pd.read_excel(filename, engine="openpyxl")
-        existing_df["author_email"] = existing_df["author_email"].astype(str).str.strip()
-        existing_df = existing_df[~existing_df["author_email"].isin(["N/A", "nan", "None", "", "NaN"])].dropna(subset=["author_email"])
-        combined_df = pd.concat([existing_df, new_df], ignore_index=True).drop_duplicates(subset=["rssUrl", "title"], keep="last")
+        with instrumentation.timer("export.excel_read"):
+            existing_df = pd.read_excel(filename, engine="openpyxl")
+        existing_df, _ = validate_emails(existing_df, label=filename)
+        combined_df = pd.concat([existing_df, new_df], ignore_index=True)
+        # Spelling variants of a feed URL count as the same podcast; rows without one fall back to the title
+        dedup_key = combined_df["rssUrl"].map(canonicalize_feed_url).fillna("title:" + combined_df["title"].astype(str))
+        combined_df = combined_df[~dedup_key.duplicated(keep="last")]
     else:
         combined_df = new_df
     if "id" in combined_df.columns:
         columns_order = ["id"] + [col for col in combined_df.columns if col != "id"]
         combined_df = combined_df[columns_order]
-    with pd.ExcelWriter(filename, engine="openpyxl", mode="w") as writer:
+    with instrumentation.timer("export.excel_write"), pd.ExcelWriter(filename, engine="openpyxl", mode="w") as writer:
         combined_df.to_excel(writer, index=False)
     print(f"✅ Data updated and saved to {filename}. Total valid records: {len(combined_df)}")
 
+def run_build(filename=EXCEL_FILENAME, rss_workers=RSS_FETCH_WORKERS, itunes_workers=ITUNES_FETCH_WORKERS, rss_budget=None,
+              rss_parse_workers=RSS_PARSE_WORKERS):
+    """
+    Run one full build (fetch, merge, save to Excel), print its timing/throughput summary
+    and write the Prometheus metrics file, also when the build fails.
+    """
+    instrumentation.reset()
+    success = False
+    try:
+        full_data = build_full_database(rss_workers=rss_workers, itunes_workers=itunes_workers, rss_budget=rss_budget,
+                                        rss_parse_workers=rss_parse_workers)
+        with profiling.profile_stage("export"):
+            save_to_excel(full_data, filename)
+        success = True
+    finally:
+        summary = instrumentation.print_summary()
+        write_metrics(summary, success)
+        if profiling.is_enabled():
+            profiling.write_summary()
+    return summary
+
 def automate_database_build():
-    """Automate the full database build process on a schedule (e.g., daily at 03:00 AM)."""
-    def job():
-        print(f"⏰ Database build started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        full_data = build_full_database()
-        save_to_excel(full_data)
-        print(f"⏰ Database build completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    schedule.every().day.at("03:00").do(job)
-    print("✅ Automation setup complete. Waiting for scheduled runs...")
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    """
+    Keep the database up to date unattended: each source is fetched on its own cadence
+    (Podchaser daily, RSS every 4 hours, iTunes weekly) and the export is refreshed after it.
+    See scheduler.py.
+    """
+    import scheduler
+    scheduler.run_scheduler()
 
 if __name__ == "__main__":
-    full_data = build_full_database()
-    save_to_excel(full_data)
+    # `python fetch.py [options]` is the full build; see cli.py for running single stages
+    import sys
+    import cli
+    cli.main(["full"] + sys.argv[1:])
     # To enable automation, uncomment the following line:
     # automate_database_build()
@@ -0,0 +1,93 @@
+# host_health.py
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+RSS_MAX_RETRIES = 2              # Retries after the first attempt, for transient errors only
+RETRY_BACKOFF_BASE = 0.5         # Seconds; attempt n waits up to base * 2**n ("full jitter")
+MAX_RETRY_AFTER = 30             # Longest Retry-After we honour, in seconds
+CIRCUIT_FAILURE_THRESHOLD = 5    # Consecutive failed attempts that open a host's circuit
+TRANSIENT_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+RATE_LIMITED_STATUS = 429        # Retried after Retry-After, but not counted against the host's circuit
+
+class TransientHTTPError(Exception):
+    """A response status worth retrying (429, 5xx...), with the server's Retry-After if any."""
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class CircuitOpenError(Exception):
+    """The feed's host failed repeatedly this run, so the request was not attempted."""
+
+def host_of(url):
+    return (urlsplit(url).hostname or "").lower()
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def is_transient(error):
+    """Whether a fetch error may go away on retry: timeouts, resets, truncated bodies, 429/5xx."""
+    import requests
+    if isinstance(error, TransientHTTPError):
+        return True
+    if isinstance(error, requests.exceptions.SSLError):
+        return False  # Certificate problems do not fix themselves within a run
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+def is_rate_limited(error):
+    """Whether a fetch error is the host throttling us (429) rather than failing."""
+    return isinstance(error, TransientHTTPError) and error.status_code == RATE_LIMITED_STATUS
+
+def backoff_delay(attempt, retry_after=None, rng=random):
+    """Full-jitter exponential backoff; a server's Retry-After is honoured up to MAX_RETRY_AFTER."""
+    delay = rng.uniform(0, RETRY_BACKOFF_BASE * 2 ** attempt)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, MAX_RETRY_AFTER))
+    return delay
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker for one crawl. After CIRCUIT_FAILURE_THRESHOLD consecutive failed
+    attempts against a host (429 replies do not count, see is_rate_limited), its circuit opens and stays open for the rest of the run, so the
+    host's remaining feeds are skipped instead of each waiting for its own timeouts.
+    """
+    def __init__(self, threshold=CIRCUIT_FAILURE_THRESHOLD):
+        self.threshold = threshold
+        self._failures = {}
+        self._open = set()
+        self._lock = threading.Lock()
+
+    def allow(self, host):
+        with self._lock:
+            return host not in self._open
+
+    def record_success(self, host):
+        with self._lock:
+            self._failures[host] = 0
+
+    def record_failure(self, host):
+        """Count a failed attempt; returns True if this failure opened the circuit."""
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if host not in self._open and self._failures[host] >= self.threshold:
+                self._open.add(host)
+                return True
+            return False
+
+    @property
+    def open_hosts(self):
+        with self._lock:
+            return set(self._open)
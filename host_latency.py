@@ -0,0 +1,156 @@
+# host_latency.py
+import json
+import threading
+import time
+
+from instrumentation import percentile
+from json_store import load_json, write_text
+
+HOST_LATENCY_FILE = "host_latency.json"
+
+LATENCY_HISTORY = 50             # Most recent samples kept per host, for connect and read separately
+MIN_LATENCY_SAMPLES = 5          # Hosts with fewer samples get the default timeout
+TIMEOUT_P99_MULTIPLIER = 3.0     # Timeout = multiplier x p99 of the host's history, clamped below
+CONNECT_TIMEOUT_RANGE = (1.0, 10.0)
+READ_TIMEOUT_RANGE = (2.0, 60.0)
+DEAD_HOST_FAILURES = 3           # Consecutive connect failures after which a host gets DEAD_CONNECT_TIMEOUT
+DEAD_CONNECT_TIMEOUT = 1.0
+READ_TIMEOUT_GROWTH = 2.0        # Each consecutive read timeout doubles the host's read timeout until a response arrives
+
+_connect_times = threading.local()
+_adapter_class = None
+
+def start_connect_timer():
+    """Forget this thread's last connect time before a request."""
+    _connect_times.seconds = None
+
+def last_connect_seconds():
+    """How long the connection opened by this thread's last request took (TCP + TLS), or None if it reused one."""
+    return getattr(_connect_times, "seconds", None)
+
+def _timed_adapter_class():
+    global _adapter_class
+    if _adapter_class is None:
+        from requests.adapters import HTTPAdapter
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        def timed(connection_class):
+            class TimedConnection(connection_class):
+                def connect(self):
+                    start = time.perf_counter()
+                    super().connect()
+                    _connect_times.seconds = time.perf_counter() - start
+            return TimedConnection
+
+        class TimedHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = timed(HTTPConnection)
+
+        class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = timed(HTTPSConnection)
+
+        class TimedHTTPAdapter(HTTPAdapter):
+            def init_poolmanager(self, *args, **kwargs):
+                super().init_poolmanager(*args, **kwargs)
+                self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+        _adapter_class = TimedHTTPAdapter
+    return _adapter_class
+
+def timed_http_adapter():
+    """A requests adapter that records each new connection's setup time (see last_connect_seconds)."""
+    return _timed_adapter_class()()
+
+def _clamp(value, bounds):
+    return min(bounds[1], max(bounds[0], value))
+
+class HostLatency:
+    """
+    Per-host connect and read (time to response headers) latency history, stored in
+    host_latency.json with the host's transfer totals, and the request timeouts derived from
+    it. A host with enough history gets TIMEOUT_P99_MULTIPLIER x its p99, so dead endpoints
+    fail fast and slow but healthy hosts get longer than the default. Consecutive read timeouts
+    widen the read timeout until the host answers again; repeated connect failures shrink the
+    connect timeout.
+    Shared by the fetch workers, so it is thread-safe; a path of None keeps it in memory.
+    """
+    def __init__(self, path=HOST_LATENCY_FILE):
+        self.path = path
+        self.hosts = load_json(path, {}) if path else {}
+        self._lock = threading.Lock()
+
+    def _host(self, host):
+        entry = self.hosts.setdefault(host, {"connect": [], "read": []})
+        entry.setdefault("connect_failures", 0)
+        entry.setdefault("read_timeouts", 0)
+        return entry
+
+    def _add(self, entry, kind, seconds):
+        entry[kind] = (entry[kind] + [round(seconds, 4)])[-LATENCY_HISTORY:]
+        entry["updated"] = time.time()
+
+    def timeout(self, host, default):
+        """(connect, read) timeout in seconds for a request to `host`."""
+        with self._lock:
+            entry = self.hosts.get(host) or {}
+            connect_samples = list(entry.get("connect", []))
+            read_samples = list(entry.get("read", []))
+            failures = entry.get("connect_failures", 0)
+            read_timeouts = entry.get("read_timeouts", 0)
+        if failures >= DEAD_HOST_FAILURES:
+            connect = DEAD_CONNECT_TIMEOUT
+        elif len(connect_samples) >= MIN_LATENCY_SAMPLES:
+            connect = _clamp(TIMEOUT_P99_MULTIPLIER * percentile(connect_samples, 99), CONNECT_TIMEOUT_RANGE)
+        else:
+            connect = default
+        if len(read_samples) >= MIN_LATENCY_SAMPLES:
+            read = _clamp(TIMEOUT_P99_MULTIPLIER * percentile(read_samples, 99), READ_TIMEOUT_RANGE)
+        else:
+            read = default
+        if read_timeouts:
+            read = min(READ_TIMEOUT_RANGE[1], max(read, read * READ_TIMEOUT_GROWTH ** read_timeouts))
+        return connect, read
+
+    def record_success(self, host, connect_seconds, elapsed_seconds):
+        """Record a response: its connect time (None on a reused connection) and time to headers."""
+        with self._lock:
+            entry = self._host(host)
+            entry["connect_failures"] = 0
+            entry["read_timeouts"] = 0
+            if connect_seconds is not None:
+                self._add(entry, "connect", connect_seconds)
+            self._add(entry, "read", max(0.0, elapsed_seconds - (connect_seconds or 0.0)))
+
+    def record_failure(self, host, error):
+        """Record a request that raised: read timeouts widen the read timeout, connect failures count towards a dead host."""
+        import requests
+        with self._lock:
+            entry = self._host(host)
+            if isinstance(error, requests.exceptions.ReadTimeout):
+                entry["connect_failures"] = 0
+                entry["read_timeouts"] += 1
+                entry["updated"] = time.time()
+            elif isinstance(error, requests.ConnectionError):
+                entry["connect_failures"] += 1
+                entry["updated"] = time.time()
+
+    def record_transfer(self, host, wire_bytes, body_bytes):
+        """Add a downloaded body's size on the wire and decompressed to the host's totals."""
+        with self._lock:
+            entry = self._host(host)
+            entry["wire_bytes"] = entry.get("wire_bytes", 0) + wire_bytes
+            entry["body_bytes"] = entry.get("body_bytes", 0) + body_bytes
+
+    def compression_ratio(self, host):
+        """Decompressed / wire bytes of everything downloaded from `host`, or None before any download."""
+        with self._lock:
+            entry = self.hosts.get(host) or {}
+            wire, body = entry.get("wire_bytes", 0), entry.get("body_bytes", 0)
+        return body / wire if wire else None
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self.hosts)
+        write_text(self.path, data)
@@ -0,0 +1,83 @@
+# instrumentation.py
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Stage name -> list of durations (seconds), and counter name -> value, for the current run
+_timings = {}
+_counters = {}
+_lock = threading.Lock()
+_run_start = time.perf_counter()
+
+def reset():
+    """Start a new run: clear all timings and counters."""
+    global _run_start
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+        _run_start = time.perf_counter()
+
+def record_time(stage, seconds):
+    """Record one duration for a stage."""
+    with _lock:
+        _timings.setdefault(stage, []).append(seconds)
+
+def count(name, value=1):
+    """Add to a counter (items, bytes, HTTP statuses, ...)."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+@contextmanager
+def timer(stage):
+    """Time the enclosed block and record it under `stage`, even if it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_time(stage, time.perf_counter() - start)
+
+def percentile(values, q):
+    """Return the q-th percentile (0-100) of a list of numbers, by nearest rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+def snapshot():
+    """Return a copy of the current timings and counters."""
+    with _lock:
+        return {stage: list(values) for stage, values in _timings.items()}, dict(_counters)
+
+def summary():
+    """Return per-stage statistics and counters for the current run."""
+    timings, counters = snapshot()
+    wall = time.perf_counter() - _run_start
+    stages = {}
+    for stage, values in timings.items():
+        stages[stage] = {
+            "count": len(values),
+            "total": sum(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            # Throughput against the run's wall clock, so concurrent stages are not overstated
+            "items_per_sec": len(values) / wall if wall else 0.0,
+        }
+    return {"wall_seconds": wall, "stages": stages, "counters": counters}
+
+def print_summary():
+    """Print the run summary: latency percentiles, throughput and counters per stage."""
+    data = summary()
+    print(f"📊 Run summary ({data['wall_seconds']:.1f}s wall clock)")
+    print(f"{'stage':<28}{'count':>8}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'items/s':>10}")
+    for stage, s in sorted(data["stages"].items()):
+        print(f"{stage:<28}{s['count']:>8}{s['total']:>10.2f}{s['p50'] * 1000:>10.1f}"
+              f"{s['p95'] * 1000:>10.1f}{s['p99'] * 1000:>10.1f}{s['items_per_sec']:>10.2f}")
+    for name, value in sorted(data["counters"].items()):
+        if name.endswith("bytes"):
+            print(f"{name:<28}{value / 1e6:>10.2f} MB")
+        else:
+            print(f"{name:<28}{value:>10.0f}")
+    return data
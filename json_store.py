@@ -0,0 +1,28 @@
+# json_store.py
+# Reading and atomic writing of the JSON state files (feed schedule, redirects, host latency,
+# crawl backlog, scheduler state, pipeline cache entries).
+import json
+import os
+
+def load_json(path, default, quiet=False):
+    """Return the JSON stored in `path`, or `default` if the file is missing or unreadable (reported unless quiet)."""
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        if not quiet:
+            print(f"❌ Error loading {path}: {e}")
+        return default
+
+def write_text(path, text):
+    """Write `text` to a temp file and rename it over `path`, so readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def write_json(path, data, **dump_options):
+    """Write `data` as JSON (see write_text); dump_options are passed to json.dumps."""
+    write_text(path, json.dumps(data, **dump_options))
@@ -0,0 +1,86 @@
+# merge_records.py
+import math
+
+from feed_urls import canonicalize_feed_url
+from feed_redirects import resolve_redirect
+
+# Source labels as set by the fetchers in fetch.py
+SOURCE_PODCHASER = "Podchaser"
+SOURCE_RSS = "RSS Feed"
+SOURCE_ITUNES = "iTunes"
+
+# Order in which sources are consulted for any field not listed below
+DEFAULT_SOURCE_PRECEDENCE = [SOURCE_PODCHASER, SOURCE_RSS, SOURCE_ITUNES]
+
+# Per-field source precedence; the first source with a usable value wins.
+# Sources missing from a field's list are still consulted afterwards, in default order.
+FIELD_PRECEDENCE = {
+    "id": [SOURCE_PODCHASER],
+    "title": [SOURCE_PODCHASER, SOURCE_RSS, SOURCE_ITUNES],
+    "description": [SOURCE_RSS, SOURCE_PODCHASER],
+    "url": [SOURCE_RSS, SOURCE_PODCHASER],
+    "webUrl": [SOURCE_RSS, SOURCE_PODCHASER],
+    "imageUrl": [SOURCE_PODCHASER, SOURCE_RSS],
+    "language": [SOURCE_RSS, SOURCE_PODCHASER],
+    "numberOfEpisodes": [SOURCE_RSS, SOURCE_PODCHASER],
+    "latestEpisodeDate": [SOURCE_RSS, SOURCE_PODCHASER],
+    "author_name": [SOURCE_RSS, SOURCE_PODCHASER],
+    "author_email": [SOURCE_PODCHASER, SOURCE_RSS],
+    "Artwork": [SOURCE_ITUNES],
+    "Episode Count": [SOURCE_ITUNES],
+    "GenreIDs": [SOURCE_ITUNES],
+    "iTunes URL": [SOURCE_ITUNES],
+}
+
+MISSING_VALUES = {"", "N/A", "nan", "NaN", "None", "null"}
+
+def is_missing(value):
+    """Return True for the placeholder values the fetchers use when a field is absent."""
+    if value is None:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    if isinstance(value, str) and value.strip() in MISSING_VALUES:
+        return True
+    return False
+
+def feed_key(record, redirects=None):
+    """Return the canonical feed URL used to group a record, or None when it has no usable feed URL."""
+    rss_url = record.get("rssUrl")
+    if is_missing(rss_url):
+        return None
+    if redirects:
+        # Sources that still list a feed's old address are grouped under its destination
+        rss_url = resolve_redirect(rss_url, redirects)
+    return canonicalize_feed_url(rss_url)
+
+def source_order(field, field_precedence=None, default_precedence=None):
+    """Return the full list of sources to consult for a field, highest priority first."""
+    field_precedence = FIELD_PRECEDENCE if field_precedence is None else field_precedence
+    default_precedence = DEFAULT_SOURCE_PRECEDENCE if default_precedence is None else default_precedence
+    preferred = list(field_precedence.get(field, default_precedence))
+    return preferred + [source for source in default_precedence if source not in preferred]
+
+def merge_group(group, fields, field_precedence=None, default_precedence=None):
+    """Combine the records of one podcast into a single row using per-field source precedence."""
+    by_source = {}
+    for record in group:
+        by_source.setdefault(record.get("source"), []).append(record)
+    merged = {}
+    for field in fields:
+        if field == "source":
+            continue
+        value = None
+        # Unknown sources are consulted last, in the order they were seen
+        order = source_order(field, field_precedence, default_precedence)
+        order += [source for source in by_source if source not in order]
+        for source in order:
+            value = next((r[field] for r in by_source.get(source, []) if not is_missing(r.get(field))), None)
+            if value is not None:
+                break
+        if value is None:
+            # Keep the first placeholder seen so the column keeps its usual sentinel
+            value = next((record[field] for record in group if field in record), None)
+        merged[field] = value
+    merged["source"] = ", ".join(source for source in by_source if source)
+    return merged
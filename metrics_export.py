@@ -0,0 +1,84 @@
+# metrics_export.py
+import os
+import time
+
+from json_store import write_text
+
+# Environment variable naming the directory watched by node_exporter's textfile collector
+TEXTFILE_DIR_ENV = "PROMETHEUS_TEXTFILE_DIR"
+METRICS_FILENAME = "podcast_build.prom"
+METRIC_PREFIX = "podcast_build"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _line(name, value, **labels):
+    label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+    return f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}" if label_text else f"{METRIC_PREFIX}_{name} {value}"
+
+def _with_prefix(counters, prefix):
+    """Yield (suffix, value) for every counter whose name starts with prefix."""
+    for name, value in sorted(counters.items()):
+        if name.startswith(prefix):
+            yield name[len(prefix):], value
+
+def render_metrics(summary, success=True, job=None):
+    """
+    Render a run summary from instrumentation.summary() in the Prometheus text exposition format.
+    With a scheduler `job`, every sample carries a job label.
+    """
+    job_labels = {"job": job} if job else {}
+
+    def line(name, value, **labels):
+        return _line(name, value, **job_labels, **labels)
+
+    counters = summary.get("counters", {})
+    stages = summary.get("stages", {})
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+        lines.extend(samples)
+
+    metric("success", "gauge", "1 if the last build completed, 0 if it failed.", [line("success", int(bool(success)))])
+    metric("last_run_timestamp_seconds", "gauge", "Unix time the last build finished.", [line("last_run_timestamp_seconds", int(time.time()))])
+    metric("duration_seconds", "gauge", "Wall clock duration of the last build.", [line("duration_seconds", f"{summary.get('wall_seconds', 0):.3f}")])
+    metric("source_records", "gauge", "Records delivered by each source in the last build.",
+           [line("source_records", int(v), source=s) for s, v in _with_prefix(counters, "records.") if s != "merged"])
+    metric("merged_records", "gauge", "Podcasts after merging all sources.", [line("merged_records", int(counters.get("records.merged", 0)))])
+    metric("source_duration_seconds", "gauge", "Time each source took in the last build.",
+           [line("source_duration_seconds", f"{stats['total']:.3f}", source=stage[len("source."):])
+            for stage, stats in sorted(stages.items()) if stage.startswith("source.")])
+    metric("http_responses", "gauge", "HTTP responses by status code in the last build.",
+           [line("http_responses", int(v), code=code, code_class=f"{code[:1]}xx") for code, v in _with_prefix(counters, "http.status.")])
+    metric("invalid_feeds", "gauge", "RSS feeds marked invalid in the last build.", [line("invalid_feeds", int(counters.get("rss.invalid", 0)))])
+    metric("rejected_emails", "gauge", "Records whose email was rejected, by source.",
+           [line("rejected_emails", int(v), source=s) for s, v in _with_prefix(counters, "emails.rejected.")])
+    metric("downloaded_bytes", "gauge", "Response bytes downloaded in the last build, by source.",
+           [line("downloaded_bytes", int(v), source=name.split(".")[0]) for name, v in sorted(counters.items()) if name.endswith(".bytes")])
+    stage_samples = []
+    for stage, stats in sorted(stages.items()):
+        for key, quantile in (("p50", "0.5"), ("p95", "0.95"), ("p99", "0.99")):
+            stage_samples.append(line("stage_duration_seconds", f"{stats[key]:.6f}", stage=stage, quantile=quantile))
+        stage_samples.append(line("stage_duration_seconds_sum", f"{stats['total']:.6f}", stage=stage))
+        stage_samples.append(line("stage_duration_seconds_count", stats["count"], stage=stage))
+    metric("stage_duration_seconds", "summary", "Per-item duration of each instrumented stage in the last build.", stage_samples)
+    return "\n".join(lines) + "\n"
+
+def write_metrics(summary, success=True, directory=None, job=None):
+    """
+    Write the metrics file atomically (temp file + rename) so the textfile collector never
+    reads a half-written file. Does nothing when no directory is configured. A scheduler `job`
+    writes podcast_build_<job>.prom, so the jobs do not overwrite each other's metrics.
+    """
+    # Read at call time so values loaded from .env are honoured
+    directory = directory or os.getenv(TEXTFILE_DIR_ENV)
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    filename = f"{METRIC_PREFIX}_{job}.prom" if job else METRICS_FILENAME
+    path = os.path.join(directory, filename)
+    write_text(path, render_metrics(summary, success, job))
+    print(f"📈 Prometheus metrics written to {path}")
+    return path
@@ -0,0 +1,66 @@
+# pipeline.py
+import itertools
+import queue
+import threading
+import time
+
+import instrumentation
+import profiling
+
+STREAM_BATCH_SIZE = 500  # Records handed from a fetcher to the store per batch
+MAX_QUEUED_BATCHES = 8   # Bounds memory when fetchers outpace the store
+
+def batched(iterable, size):
+    """Yield lists of up to `size` items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def _produce(name, records, out, batch_size):
+    """Drain one source generator into the queue in batches, isolating its failures."""
+    start = time.perf_counter()
+    count = 0
+    error = None
+    try:
+        with profiling.profile_stage(f"source.{name}"):
+            for batch in batched(records, batch_size):
+                out.put((name, batch, None))
+                count += len(batch)
+    except Exception as e:
+        error = e
+        print(f"❌ Source {name} failed after {count} records: {e}")
+    elapsed = time.perf_counter() - start
+    instrumentation.record_time(f"source.{name}", elapsed)
+    instrumentation.count(f"records.{name}", count)
+    out.put((name, None, {"records": count, "seconds": elapsed, "error": error}))
+
+def run_pipeline(sources, store, batch_size=STREAM_BATCH_SIZE):
+    """
+    Stream records from several sources into the store concurrently.
+
+    `sources` maps a source name to a record generator. Each generator runs in its own
+    thread and hands batches through a bounded queue; the calling thread commits every
+    batch to the store as it arrives. Returns {source: {"records", "seconds", "error"}}.
+    """
+    out = queue.Queue(maxsize=MAX_QUEUED_BATCHES)
+    threads = [
+        threading.Thread(target=_produce, args=(name, records, out, batch_size), name=f"source-{name}", daemon=True)
+        for name, records in sources.items()
+    ]
+    for thread in threads:
+        thread.start()
+    stats = {}
+    with profiling.profile_stage("store"):
+        while len(stats) < len(sources):
+            name, batch, done = out.get()
+            if done is not None:
+                stats[name] = done
+                print(f"⏱️ {name}: {done['records']} records in {done['seconds']:.1f}s")
+                continue
+            store.add_batch(batch)
+    for thread in threads:
+        thread.join()
+    return stats
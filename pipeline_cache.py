@@ -0,0 +1,116 @@
+# pipeline_cache.py
+import hashlib
+import json
+import os
+import shutil
+
+from json_store import load_json, write_json
+
+CACHE_DIR = ".pipeline_cache"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class StageCache:
+    """
+    Make-style memoization of pipeline stages. A stage's key is a hash of its name, parameters
+    and the contents of its input files (directories are hashed file by file). When the key
+    matches the last run and the outputs are unchanged, the stage is skipped; if the outputs
+    were deleted they are restored from the copies kept in .pipeline_cache/objects/.
+
+    File hashes are remembered by (size, mtime), so unchanged inputs are not re-read.
+    """
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._hashes_path = os.path.join(directory, "file_hashes.json")
+        self._file_hashes = load_json(self._hashes_path, {}, quiet=True)
+
+    def file_hash(self, path):
+        """sha256 of a file's contents, or None if it does not exist."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        signature = [stat.st_size, stat.st_mtime_ns]
+        cached = self._file_hashes.get(os.path.abspath(path))
+        if cached and cached[0] == signature:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        self._file_hashes[os.path.abspath(path)] = [signature, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def path_hash(self, path):
+        """Hash a file, or a directory as the sorted names and hashes of the files below it."""
+        if not os.path.isdir(path):
+            return self.file_hash(path)
+        entries = []
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                entries.append([os.path.relpath(file_path, path), self.file_hash(file_path)])
+        return hashlib.sha256(json.dumps(entries).encode("utf-8")).hexdigest()
+
+    def stage_key(self, stage, inputs, params):
+        """Hash of a stage's name, parameters and input contents."""
+        payload = {
+            "stage": stage,
+            "params": params,
+            "inputs": {path: self.path_hash(path) for path in inputs},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, stage):
+        return os.path.join(self.directory, f"{stage}.json")
+
+    def is_fresh(self, stage, key, outputs):
+        """
+        True if the stage last ran with this key and its outputs are as it left them.
+        Missing outputs are restored from the cache first.
+        """
+        entry = load_json(self._entry_path(stage), None, quiet=True)
+        if not entry or entry.get("key") != key:
+            return False
+        for path in outputs:
+            recorded = entry["outputs"].get(path)
+            current = self.file_hash(path)
+            if current == recorded and recorded is not None:
+                continue
+            cached_copy = os.path.join(self.objects_dir, recorded or "")
+            if current is None and recorded and os.path.exists(cached_copy):
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                shutil.copyfile(cached_copy, path)
+                print(f"♻️ Restored {path} from the pipeline cache.")
+                continue
+            return False
+        return True
+
+    def save(self, stage, key, outputs):
+        """Record a finished stage: its key, output hashes and a copy of each output."""
+        hashes = {}
+        for path in outputs:
+            digest = self.file_hash(path)
+            hashes[path] = digest
+            if digest and not os.path.exists(os.path.join(self.objects_dir, digest)):
+                shutil.copyfile(path, os.path.join(self.objects_dir, digest))
+        write_json(self._entry_path(stage), {"key": key, "outputs": hashes}, indent=2, sort_keys=True)
+        self._prune()
+        self.flush()
+
+    def _prune(self):
+        """Delete cached output copies that no stage entry refers to any more."""
+        referenced = set()
+        for name in os.listdir(self.directory):
+            if name.endswith(".json") and name != os.path.basename(self._hashes_path):
+                entry = load_json(os.path.join(self.directory, name), {}, quiet=True)
+                referenced.update(digest for digest in entry.get("outputs", {}).values() if digest)
+        for digest in os.listdir(self.objects_dir):
+            if digest not in referenced:
+                os.remove(os.path.join(self.objects_dir, digest))
+
+    def flush(self):
+        """Persist the remembered file hashes."""
+        write_json(self._hashes_path, self._file_hashes, indent=2, sort_keys=True)
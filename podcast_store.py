@@ -0,0 +1,82 @@
+# podcast_store.py
+import itertools
+import json
+import sqlite3
+import threading
+
+import instrumentation
+from merge_records import feed_key, merge_group
+from feed_redirects import load_redirects
+from records import RECORD_FIELDS, PodcastRecords
+
+STORE_FILENAME = "podcasts.db"
+
+class PodcastStore:
+    """
+    Incremental on-disk store of source records, backed by SQLite.
+
+    Each batch is committed as soon as it arrives, keyed by (feed key, source), so a
+    crash loses at most the batch in flight. Merging into one row per podcast happens
+    when reading, by streaming the records ordered by feed key.
+    """
+    def __init__(self, path=STORE_FILENAME):
+        self.path = path
+        self.redirects = load_redirects()
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS source_records ("
+            " feed_key TEXT NOT NULL,"
+            " source TEXT NOT NULL,"
+            " record TEXT NOT NULL,"
+            " PRIMARY KEY (feed_key, source))"
+        )
+        self.conn.commit()
+
+    def _key(self, record):
+        key = feed_key(record, self.redirects)
+        if key is None:
+            # Records without a feed URL cannot be merged; keep one row per source id/title
+            key = f"~{record.get('source')}:{record.get('id') or record.get('title')}"
+        return key
+
+    def add_batch(self, records):
+        """Upsert a batch of records (dicts) and commit it. Returns the number of records written."""
+        rows = [(self._key(r), str(r.get("source")), json.dumps(r, default=str)) for r in records]
+        with self._lock, instrumentation.timer("store.add_batch"):
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO source_records (feed_key, source, record) VALUES (?, ?, ?)", rows
+            )
+            self.conn.commit()
+        return len(rows)
+
+    def count(self):
+        """Return the number of stored source records."""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM source_records").fetchone()[0]
+
+    def iter_merged(self, field_precedence=None, default_precedence=None):
+        """Yield one merged record per podcast, holding only one podcast's records in memory at a time."""
+        # A separate connection lets batches keep committing while a reader streams
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute("SELECT feed_key, record FROM source_records ORDER BY feed_key")
+            for key, rows in itertools.groupby(cursor, key=lambda row: row[0]):
+                group = [json.loads(record) for _, record in rows]
+                if key.startswith("~"):
+                    yield from group
+                    continue
+                fields = list(dict.fromkeys(RECORD_FIELDS + [f for r in group for f in r]))
+                yield merge_group(group, fields, field_precedence, default_precedence)
+        finally:
+            conn.close()
+
+    def merged_records(self, field_precedence=None, default_precedence=None):
+        """Return all merged podcasts as a PodcastRecords collection."""
+        with instrumentation.timer("store.merge"):
+            merged = PodcastRecords(self.iter_merged(field_precedence, default_precedence))
+        instrumentation.count("records.merged", len(merged))
+        return merged
+
+    def close(self):
+        self.conn.close()
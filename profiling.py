@@ -0,0 +1,85 @@
+# profiling.py
+import cProfile
+import io
+import os
+import pstats
+import threading
+from contextlib import contextmanager
+
+PROFILE_DIR = "profiles"
+PROFILE_TOP_N = 25  # Functions listed in each hot-function summary
+
+_settings = {"enabled": False, "directory": PROFILE_DIR, "top_n": PROFILE_TOP_N}
+_stage_files = []
+_lock = threading.Lock()
+
+def enable(directory=PROFILE_DIR, top_n=PROFILE_TOP_N):
+    """Turn on per-stage profiling for this process."""
+    _settings.update(enabled=True, directory=directory, top_n=top_n)
+    os.makedirs(directory, exist_ok=True)
+
+def is_enabled():
+    return _settings["enabled"]
+
+def _top_functions(stats, sort_key, top_n):
+    stream = io.StringIO()
+    pstats.Stats(stats, stream=stream).sort_stats(sort_key).print_stats(top_n)
+    return stream.getvalue()
+
+@contextmanager
+def profile_stage(stage):
+    """
+    Profile the enclosed block with cProfile when profiling is enabled and save
+    profiles/<stage>.prof plus a top-N text summary. cProfile only follows the thread
+    that enabled it, so each stage is profiled on the thread that runs it.
+    """
+    if not is_enabled():
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Another profiler is already active on this interpreter (Python 3.12+ allows only one)
+        print(f"⚠️ Cannot profile stage {stage}: {e}")
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _save_stage(stage, profiler)
+
+def _save_stage(stage, profiler):
+    directory, top_n = _settings["directory"], _settings["top_n"]
+    name = stage.replace(" ", "_").replace("/", "_")
+    prof_path = os.path.join(directory, f"{name}.prof")
+    profiler.dump_stats(prof_path)
+    with open(os.path.join(directory, f"{name}.txt"), "w", encoding="utf-8") as f:
+        f.write(f"Stage: {stage}\n\n== Top {top_n} by own time ==\n")
+        f.write(_top_functions(profiler, "tottime", top_n))
+        f.write(f"\n== Top {top_n} by cumulative time ==\n")
+        f.write(_top_functions(profiler, "cumulative", top_n))
+    with _lock:
+        _stage_files.append((stage, prof_path))
+    print(f"🔬 Profile for stage {stage} saved to {prof_path}")
+
+def write_summary():
+    """Write and print the top-N hot functions across all profiled stages."""
+    with _lock:
+        stage_files = list(_stage_files)
+    if not stage_files:
+        return None
+    directory, top_n = _settings["directory"], _settings["top_n"]
+    combined = pstats.Stats(*[path for _, path in stage_files])
+    stream = io.StringIO()
+    combined.stream = stream
+    combined.sort_stats("tottime").print_stats(top_n)
+    report = (f"Stages: {', '.join(stage for stage, _ in stage_files)}\n\n"
+              f"== Top {top_n} hot functions by own time, all stages ==\n{stream.getvalue()}")
+    path = os.path.join(directory, "summary.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(report)
+    print(report)
+    print(f"🔬 Profiling summary saved to {path}")
+    return path
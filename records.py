@@ -0,0 +1,106 @@
+# records.py
+import sys
+
+# Fields every fetcher fills in, in export order
+RECORD_FIELDS = [
+    "id", "title", "description", "url", "webUrl", "rssUrl", "imageUrl", "language",
+    "numberOfEpisodes", "startDate", "latestEpisodeDate", "categories",
+    "author_name", "author_email", "source",
+]
+
+# Low-cardinality fields stored as pandas categoricals
+CATEGORICAL_FIELDS = {"source", "language"}
+
+# Placeholder strings repeated across most records; interned so every row shares one object
+SENTINELS = {"N/A", "", "nan", "None"}
+
+class PodcastRecords:
+    """
+    Column-array-backed collection of podcast records.
+
+    Each field is stored as one list instead of one dict per podcast, sentinel and
+    low-cardinality strings are interned, and to_frame() hands the columns straight
+    to pandas with categorical dtypes, without building per-row dicts.
+    """
+    __slots__ = ("columns", "_length")
+
+    def __init__(self, records=None, fields=None):
+        self.columns = {field: [] for field in (fields or RECORD_FIELDS)}
+        self._length = 0
+        if records is not None:
+            self.extend(records)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        """Yield each record as a dict (built on demand)."""
+        names = list(self.columns)
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
+
+    def __add__(self, other):
+        combined = PodcastRecords(fields=list(self.columns))
+        combined.extend(self)
+        combined.extend(other)
+        return combined
+
+    def _add_field(self, field):
+        self.columns[field] = [None] * self._length
+
+    @staticmethod
+    def _compact(field, value):
+        if isinstance(value, str) and (value in SENTINELS or field in CATEGORICAL_FIELDS):
+            return sys.intern(value)
+        return value
+
+    def append(self, record):
+        """Append one record given as a dict; unknown fields add a new column."""
+        for field in record:
+            if field not in self.columns:
+                self._add_field(field)
+        for field, column in self.columns.items():
+            column.append(self._compact(field, record.get(field)))
+        self._length += 1
+
+    def extend(self, records):
+        """Append records from an iterable of dicts or another PodcastRecords."""
+        if isinstance(records, PodcastRecords):
+            for field in records.columns:
+                if field not in self.columns:
+                    self._add_field(field)
+            for field, column in self.columns.items():
+                column.extend(records.columns.get(field, [None] * len(records)))
+            self._length += len(records)
+            return
+        for record in records:
+            self.append(record)
+
+    def to_frame(self):
+        """Convert to a DataFrame column by column, with categorical source and language."""
+        import pandas as pd
+        data = {}
+        for field, column in self.columns.items():
+            data[field] = pd.Categorical(column) if field in CATEGORICAL_FIELDS else column
+        return pd.DataFrame(data, columns=list(self.columns))
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build a collection from a DataFrame without going through per-row dicts."""
+        import pandas as pd
+        records = cls(fields=list(dict.fromkeys(RECORD_FIELDS + list(df.columns))))
+        for field, column in records.columns.items():
+            if field in df.columns:
+                values = df[field].astype(object).where(pd.notna(df[field]), None).tolist()
+                column.extend(cls._compact(field, value) for value in values)
+            else:
+                column.extend([None] * len(df))
+        records._length = len(df)
+        return records
+
+def records_to_frame(data):
+    """Return a DataFrame for a PodcastRecords collection or a plain list of dicts."""
+    if isinstance(data, PodcastRecords):
+        return data.to_frame()
+    import pandas as pd
+    return pd.DataFrame(data)
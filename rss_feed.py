@@ -47,7 +47,6 @@ RSS_FEEDS = [
     "http://cast.rocks/hosting/28841/feeds/L19TI.xml",
     "http://charliecharlieone.com/feed/podcast/",
     "http://cinemageekly.com/feed/mtgt9k/",
-    "http://classicmysteries.libsyn.com/rss",
     "http://codewinds.com/podcast-audio-rss.xml",
     "http://comedyfilmnerds.libsyn.com/rss",
     "http://comicbookpage.com/Podcast/?feed=rss2",
@@ -190,7 +189,6 @@ RSS_FEEDS = [
     "http://feeds.feedburner.com/streetrodandcustomradio",
     "http://feeds.feedburner.com/talkintoonswithrobpaulsen",
     "http://feeds.feedburner.com/teachsuzuki",
-    "http://feeds.feedburner.com/thebbpodcast",
     "http://feeds.feedburner.com/themessagepodcast",
     "http://feeds.feedburner.com/tmsidk",
     "http://feeds.feedburner.com/tnyauthorsvoice",
@@ -230,7 +228,6 @@ RSS_FEEDS = [
     "http://feeds2.feedburner.com/startupdaddypod",
     "http://feeds2.feedburner.com/talk_to_me",
     "http://feeds2.feedburner.com/zombietakeout",
-    "http://ffkhunion.libsyn.com/rss",
     "http://fiveminutemd.com/feed/fiveminutemd-comfeedfiveminutehabits/",
     "http://frenchyourway.com.au/category/fywpodcast/feed",
     "http://futuromedia.libsyn.com/rss",
@@ -255,14 +252,12 @@ RSS_FEEDS = [
     "http://jeffersonhour.libsyn.com/rss",
     "http://justcast.herokuapp.com/shows/andrey-de-lima-meditacao-guiada-relaxar-e-meditar/audioposts.rss",
     "http://justinhealth.libsyn.com/rss",
-    "http://knitmoregirls.libsyn.com/rss",
     "http://kunstlercast.libsyn.com/rss",
     "http://kylethiermann.libsyn.com/rss",
     "http://learnrealspanish.libsyn.com/rss",
     "http://library.yctorah.org/dafyomi/feed/dafyomi/",
     "http://lulaoshichinese.podomatic.com/rss2.xml",
     "http://magiclessons.libsyn.com/rss",
-    "http://makingitwithchrisg.libsyn.com/rss",
     "http://media-podcast.open.ac.uk/feeds/2190_60secondadventuresineconomics/desktop-all/rss2.xml",
     "http://media-podcast.open.ac.uk/feeds/2190_60secondadventuresineconomics/ipod-all/rss2.xml",
     "http://media-podcast.open.ac.uk/feeds/epub-y159-3/epub/rss2.xml",
@@ -403,7 +398,6 @@ RSS_FEEDS = [
     "http://thedirtbag.libsyn.com/rss",
     "http://thegrowthshow.hubspot.libsynpro.com/rss",
     "http://thehangardeckpodcast.libsyn.com/rss",
-    "http://theotherfword.libsyn.com/rss",
     "http://thesalesevangelist.com/feed/podcast/",
     "http://theshortcoat.com/feed/podcast/",
     "http://thirdeyedrops.libsyn.com/rss",
@@ -457,7 +451,6 @@ RSS_FEEDS = [
     "http://www.cliffordandnorm.com/clifford_and_norm_comedy_talk_radio_show.xml",
     "http://www.dfbpodcast.com/feed/podcast/",
     "http://www.disunplugged.com/podcast-dl.xml",
-    "http://www.drabblecast.org/feed/podcast-m4a/",
     "http://www.dvidshub.net/rss/podcast/12",
     "http://www.ejunto.org/feeds/polk.xml",
     "http://www.evan-moor.com/podcasts/strwtk/levelE/levelE.xml",
@@ -1891,7 +1884,6 @@ RSS_FEEDS = [
     "https://aod.nrjaudio.fm/xml/169.xml",
     "https://api.allportsopen.org/api/episodes/getfeed?ID=11",
     "https://api.audioteca.rac1.cat/rss/el-mon/HOUR",
-    "https://api.audioteca.rac1.cat/rss/el-mon/HOUR/",
     "https://api.audioteca.rac1.cat/rss/tu-diras/",
     "https://api.audioteca.rac1.cat/rss/versio/",
     "https://api.canalacademies.com/itunes-podcast",
@@ -0,0 +1,42 @@
+# rss_parsing.py
+# Feed parsing for the RSS stage, kept apart from fetch.py so worker processes only import
+# what parsing needs. parse_feed_bytes is a top-level function returning plain data, so it
+# can be sent to a process pool and its result pickled back.
+import time
+import xml.etree.ElementTree as ET
+
+from feed_schedule import entry_timestamps
+
+ITUNES_NAMESPACE = {"itunes": "http://www.itunes.com/dtds/podcast-1.0.dtd"}
+
+def parse_feed_bytes(body, content_type=""):
+    """
+    Parse one feed body (raw bytes) with feedparser and ElementTree. Returns a dict of the
+    channel fields, episode count, entry dates and itunes:owner email, plus the parse timings;
+    on a parse error the dict holds "error" instead of the fields.
+    """
+    import feedparser
+    timings = {}
+    try:
+        start = time.perf_counter()
+        parsed = feedparser.parse(body, response_headers={"content-type": content_type})
+        timings["rss.feedparser"] = time.perf_counter() - start
+        start = time.perf_counter()
+        email_elem = ET.fromstring(body).find(".//itunes:owner/itunes:email", ITUNES_NAMESPACE)
+        timings["rss.elementtree"] = time.perf_counter() - start
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}", "timings": timings}
+    channel = parsed.feed
+    return {
+        "title": channel.get("title", "N/A"),
+        "description": channel.get("description", "N/A"),
+        "link": channel.get("link", "N/A"),
+        "image": channel.get("image", {}).get("href", "N/A"),
+        "language": channel.get("language", "N/A"),
+        "author": channel.get("author", "N/A"),
+        "episodes": len(parsed.entries),
+        "latest_published": parsed.entries[0].get("published", "N/A") if parsed.entries else "N/A",
+        "entry_times": entry_timestamps(parsed.entries),
+        "author_email": email_elem.text.strip() if email_elem is not None and email_elem.text else None,
+        "timings": timings,
+    }
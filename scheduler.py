@@ -0,0 +1,138 @@
+# scheduler.py
+# Runs each source on its own cadence instead of one daily full build:
+#   podchaser  daily        full page crawl (the API query has no updated-since filter)
+#   rss        every 4h     feed revalidation
+#   itunes     weekly       alphabet crawl, then extract-raw
+# After a source is fetched, `build export` re-merges and re-exports; unchanged stages are skipped.
+import os
+import random
+import time
+from datetime import datetime
+
+from json_store import load_json, write_json
+
+SCHEDULER_STATE_FILE = "scheduler_state.json"
+SCHEDULER_LOCK_FILE = "scheduler.lock"
+
+# Source -> interval in seconds
+SOURCE_INTERVALS = {
+    "podchaser": 24 * 60 * 60,
+    "rss": 4 * 60 * 60,
+    "itunes": 7 * 24 * 60 * 60,
+}
+# Stage CLI invocations (see cli.py) making up each source's job
+SOURCE_JOBS = {
+    "podchaser": [["podchaser"], ["build", "export"]],
+    "rss": [["rss"], ["build", "export"]],
+    "itunes": [["itunes"], ["extract-raw"], ["build", "export"]],
+}
+JITTER_FRACTION = 0.1          # Each next run is delayed by up to 10% of the interval
+RETRY_AFTER_FAILURE = 15 * 60  # A failed job is retried after 15 minutes (or its interval, if shorter)
+MAX_SLEEP = 300                # Re-check at least every 5 minutes, so clock jumps are noticed
+
+def _timestamp(seconds):
+    return datetime.fromtimestamp(seconds).strftime("%Y-%m-%d %H:%M:%S")
+
+def load_state(path=SCHEDULER_STATE_FILE):
+    """Return {source: {"last_start", "last_finish", "last_error", "next_due"}} from the last run."""
+    return load_json(path, {})
+
+def save_state(state, path=SCHEDULER_STATE_FILE):
+    write_json(path, state, indent=2, sort_keys=True)
+
+def next_due(start, interval, jitter=JITTER_FRACTION, rng=random):
+    """When a job that started at `start` is next due: one interval later plus random jitter."""
+    return start + interval + rng.uniform(0, jitter * interval)
+
+class SchedulerLock:
+    """
+    Exclusive lock file holding the owner's PID, so two schedulers (or a scheduler restarted
+    while its predecessor is still busy) never run jobs at the same time. A lock left behind
+    by a process that no longer exists is taken over.
+    """
+    def __init__(self, path=SCHEDULER_LOCK_FILE):
+        self.path = path
+
+    def _owner_alive(self):
+        if os.name == "nt":
+            # os.kill cannot probe a process on Windows without terminating it; delete a stale lock by hand
+            return True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                pid = int(f.read().strip() or 0)
+            os.kill(pid, 0)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def __enter__(self):
+        for _ in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._owner_alive():
+                    raise RuntimeError(f"Another scheduler is running (lock file {self.path}).")
+                print(f"♻️ Removing stale scheduler lock {self.path}.")
+                os.remove(self.path)
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return self
+        raise RuntimeError(f"Could not acquire scheduler lock {self.path}.")
+
+    def __exit__(self, *exc):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        return False
+
+def run_job(source):
+    """
+    Run the stage commands of one source's job as one build, so the job gets a single summary
+    and its own Prometheus metrics file (success=0 when a stage fails); raises if a stage fails.
+    """
+    import cli
+    parser = cli.build_parser()
+    print(f"⏰ {source}: running " + ", ".join(f"`cli.py {' '.join(argv)}`" for argv in SOURCE_JOBS[source]))
+    cli.run_stages([parser.parse_args(argv) for argv in SOURCE_JOBS[source]], job=source)
+
+def due_sources(state, intervals, now):
+    """Sources whose next run is due, most overdue first. Sources never run before are due now."""
+    due = [(state.get(source, {}).get("next_due", 0), source) for source in intervals]
+    return [source for due_at, source in sorted(due) if due_at <= now]
+
+def run_due_jobs(state, intervals=SOURCE_INTERVALS, state_path=SCHEDULER_STATE_FILE, job=run_job):
+    """
+    Run every due job once, one after another, persisting the state after each.
+    Runs missed while the scheduler was down are caught up with a single run per source.
+    """
+    for source in due_sources(state, intervals, time.time()):
+        entry = state.setdefault(source, {})
+        overdue = time.time() - entry.get("next_due", time.time())
+        if overdue > intervals[source]:
+            print(f"⏰ {source}: catching up, {overdue / 3600:.1f}h overdue")
+        start = time.time()
+        entry["last_start"] = start
+        try:
+            job(source)
+            entry["last_error"] = None
+            entry["next_due"] = next_due(start, intervals[source])
+        except (Exception, SystemExit) as e:
+            print(f"❌ {source} job failed: {e}")
+            entry["last_error"] = str(e)
+            entry["next_due"] = time.time() + min(RETRY_AFTER_FAILURE, intervals[source])
+        entry["last_finish"] = time.time()
+        save_state(state, state_path)
+        print(f"⏰ {source}: finished in {entry['last_finish'] - start:.0f}s, next run at {_timestamp(entry['next_due'])}")
+    return state
+
+def run_scheduler(intervals=SOURCE_INTERVALS, once=False, state_path=SCHEDULER_STATE_FILE, lock_path=SCHEDULER_LOCK_FILE):
+    """Run due jobs until interrupted (or just once, e.g. from cron, when `once` is set)."""
+    with SchedulerLock(lock_path):
+        state = load_state(state_path)
+        print("✅ Scheduler started: " + ", ".join(f"{source} every {seconds / 3600:g}h" for source, seconds in intervals.items()))
+        while True:
+            run_due_jobs(state, intervals, state_path)
+            if once:
+                return state
+            upcoming = min(state[source]["next_due"] for source in intervals)
+            time.sleep(min(MAX_SLEEP, max(1, upcoming - time.time())))
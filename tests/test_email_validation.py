@@ -0,0 +1,62 @@
+# tests/test_email_validation.py
+import pandas as pd
+import pytest
+
+import fetch
+from email_validation import normalize_emails, valid_email_mask
+from records import PodcastRecords
+
+@pytest.mark.parametrize("value, address", [
+    ("cjr.kirchner@gmail.com (Lauren Kirchner)", "cjr.kirchner@gmail.com"),
+    ("mailto:Joe@Example.org?subject=Podcast", "joe@example.org"),
+    ("Host Name <host@show.fm>", "host@show.fm"),
+    (" host@show.fm. ", "host@show.fm"),
+    ("LearnOutLoud.com", "learnoutloud.com"),
+    (None, ""),
+])
+def test_normalize_extracts_the_address(value, address):
+    assert normalize_emails([value]).tolist() == [address]
+
+@pytest.mark.parametrize("address, valid", [
+    ("joe@email.com", True),
+    ("info@xn--e1afmkfd.xn--p1ai", True),
+    ("joe@example.com", False),
+    ("randomteapodcasts.@gmail.com", False),
+    ("http://show.podomatic.com/rss2.xml", False),
+    ("n/a", False),
+])
+def test_valid_email_mask(address, valid):
+    assert valid_email_mask(pd.Series([address])).tolist() == [valid]
+
+class FakeCheckpoint:
+    def __init__(self):
+        self.done = []
+
+    def mark_done(self, key, records=None):
+        self.done.append(key)
+
+    def flush(self):
+        pass
+
+class FakeSchedule:
+    def update(self, *args, **kwargs):
+        pass
+
+    def forget(self, url):
+        pass
+
+    def save(self):
+        pass
+
+def test_rejected_email_drops_the_record_but_keeps_the_feed(monkeypatch):
+    removed = []
+    monkeypatch.setattr(fetch, "remove_invalid_feeds", removed.extend)
+    feeds = ["https://good.example.net/feed", "https://rejected.example.net/feed"]
+    batch = PodcastRecords()
+    for feed, email in zip(feeds, ["owner@show.fm", "owner@example.com"]):
+        batch.append({"rssUrl": feed, "title": "Show", "author_email": email, "source": "RSS Feed"})
+    checkpoint = FakeCheckpoint()
+    valid = fetch._finish_rss_batch(batch, feeds, [([], None)] * 2, {}, {}, checkpoint, FakeSchedule())
+    assert [record["rssUrl"] for record in valid] == feeds[:1]
+    assert removed == []
+    assert sorted(checkpoint.done) == sorted(feeds)
@@ -0,0 +1,82 @@
+# tests/test_unreachable_feeds.py
+# Feeds are only removed from rss_feed.py after failing themselves across runs; a host that is
+# throttling, or whose circuit is open, must never get its feeds deleted.
+import datetime
+
+import pytest
+
+import fetch
+from feed_schedule import DAY, FAILED_RUNS_LIMIT, FeedSchedule
+from feed_urls import canonicalize_feed_url
+from host_health import CircuitBreaker, CircuitOpenError, TransientHTTPError
+
+FEED = "https://anchor.fm/s/123/podcast/rss"
+CACHED = {"rssUrl": FEED, "title": "Cached", "author_email": "host@example.org", "source": "RSS Feed"}
+
+class FakeCheckpoint:
+    def mark_done(self, *args):
+        pass
+
+    def flush(self):
+        pass
+
+@pytest.fixture
+def schedule(tmp_path, monkeypatch):
+    removed = []
+    monkeypatch.setattr(fetch, "remove_invalid_feeds", removed.extend)
+    monkeypatch.setattr(fetch, "log_invalid_rss", lambda feed, reason: None)
+    feed_schedule = FeedSchedule(str(tmp_path / "feed_schedule.json"))
+    feed_schedule.feeds[canonicalize_feed_url(FEED)] = {"record": CACHED}
+    feed_schedule.removed = removed
+    return feed_schedule
+
+def _run_days(feed_schedule, monkeypatch, retry_reason, runs):
+    """Process `runs` batches, two days apart, in which FEED ended with `retry_reason`."""
+    start = 1_700_000_000
+    yielded = []
+    for run in range(runs):
+        monkeypatch.setattr(fetch.time, "time", lambda: start + 2 * run * DAY)
+        downloaded = [(FEED, (None, "", None, None, retry_reason), False)]
+        yielded.append(list(fetch._process_rss_batch(downloaded, iter([]), FakeCheckpoint(), feed_schedule, [])))
+    return yielded
+
+@pytest.mark.parametrize("retry_reason", ["short_circuited", "rate_limited"])
+def test_feed_not_requested_is_never_removed(schedule, monkeypatch, retry_reason):
+    yielded = _run_days(schedule, monkeypatch, retry_reason, FAILED_RUNS_LIMIT + 2)
+    assert schedule.removed == []
+    assert all(records == [CACHED] for records in yielded)
+    assert "failed_runs" not in schedule.entry(FEED)
+
+def test_feed_failing_itself_is_removed(schedule, monkeypatch):
+    yielded = _run_days(schedule, monkeypatch, "transient", FAILED_RUNS_LIMIT)
+    assert schedule.removed == [FEED]
+    assert yielded[-1] == []
+    assert all(records == [CACHED] for records in yielded[:-1])
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {"Retry-After": "0"}
+        self.elapsed = datetime.timedelta(seconds=0.01)
+
+    def close(self):
+        pass
+
+class FakeSession:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.status_code)
+
+@pytest.mark.parametrize("status_code, error, opens_circuit", [
+    (429, TransientHTTPError, False),  # Retried until the attempts run out
+    (503, CircuitOpenError, True),     # The first failure opens the circuit, so the retry is not sent
+])
+def test_rate_limiting_does_not_open_the_circuit(monkeypatch, status_code, error, opens_circuit):
+    monkeypatch.setattr(fetch, "_rss_session", lambda: FakeSession(status_code))
+    monkeypatch.setattr(fetch.time, "sleep", lambda seconds: None)
+    breaker = CircuitBreaker(threshold=1)
+    with pytest.raises(error):
+        fetch._download_feed(FEED, breaker, fetch.HostLatency(path=None))
+    assert (fetch.host_of(FEED) in breaker.open_hosts) == opens_circuit